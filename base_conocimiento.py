@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Base de conocimiento de nombres específicos (antes el dict DATOS_ESPECIFICOS
+dentro de generador_nombres.py).
+
+- Fuente editable: datos_especificos.json  ({"nombre en minúsculas": {...}}).
+- Almacén indexado: datos_especificos.sqlite, una fila por nombre. Se construye a
+  partir del JSON y se reconstruye sola si el JSON cambió (tamaño/mtime).
+- BaseConocimiento.obtener(clave) consulta solo la entrada pedida, con un LRU
+  acotado delante, así que ni el import ni la memoria crecen con la base
+  (en memoria quedan solo los nombres, para responder "no hay datos" sin consultar).
+- Si la carpeta del módulo no se puede escribir (instalación de solo lectura), el
+  almacén se construye en la caché del usuario y, si tampoco se puede, en memoria.
+
+Cada entrada debe tener las claves: etimologia, variantes, personajes,
+simbolismo, relato_personalizado.
+
+Uso:
+  py base_conocimiento.py importar [--desde datos_especificos.json] [--db datos_especificos.sqlite]
+  py base_conocimiento.py validar  [--desde datos_especificos.json]
+  py base_conocimiento.py ver alejandro
+"""
+
+import argparse, hashlib, json, os, sqlite3, sys
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RUTA_JSON = os.path.join(BASE_DIR, "datos_especificos.json")
+RUTA_DB = os.path.join(BASE_DIR, "datos_especificos.sqlite")
+CLAVES = ("etimologia", "variantes", "personajes", "simbolismo", "relato_personalizado")
+CLAVES_LISTA = ("variantes", "personajes")
+TAM_LRU = 1024
+
+def validar_entrada(nombre: str, entrada) -> List[str]:
+    """Devuelve los problemas de una entrada (lista vacía si es válida)."""
+    if not isinstance(entrada, dict):
+        return [f"{nombre}: la entrada no es un objeto"]
+    errores = []
+    if nombre != nombre.lower():
+        errores.append(f"{nombre}: la clave debe ir en minúsculas")
+    for clave in CLAVES:
+        if clave not in entrada:
+            errores.append(f"{nombre}: falta '{clave}'")
+        elif clave in CLAVES_LISTA:
+            if not isinstance(entrada[clave], list) or not all(isinstance(x, str) for x in entrada[clave]):
+                errores.append(f"{nombre}: '{clave}' debe ser una lista de textos")
+        elif not isinstance(entrada[clave], str):
+            errores.append(f"{nombre}: '{clave}' debe ser texto")
+    return errores
+
+def validar(datos: Dict[str, Dict]) -> List[str]:
+    errores = []
+    for nombre, entrada in datos.items():
+        errores.extend(validar_entrada(nombre, entrada))
+    return errores
+
+def _firma(ruta: str) -> str:
+    st = os.stat(ruta)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+def importar(datos: Dict[str, Dict], ruta_db: str = RUTA_DB, firma: str = "") -> int:
+    """
+    Valida `datos` (el dict de siempre) y escribe el almacén SQLite.
+    Lanza ValueError con todos los problemas si alguna entrada no es válida.
+    """
+    _comprobar(datos)
+    # Temporal por proceso: varios workers pueden reconstruir a la vez sin pisarse.
+    tmp = f"{ruta_db}.{os.getpid()}.tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    con = sqlite3.connect(tmp)
+    try:
+        _volcar(con, datos, firma)
+    finally:
+        con.close()
+    os.replace(tmp, ruta_db)
+    return len(datos)
+
+def _comprobar(datos: Dict[str, Dict]) -> None:
+    errores = validar(datos)
+    if errores:
+        raise ValueError("Entradas inválidas:\n  " + "\n  ".join(errores))
+
+def _volcar(con: sqlite3.Connection, datos: Dict[str, Dict], firma: str) -> None:
+    with con:
+        con.execute("CREATE TABLE datos (nombre TEXT PRIMARY KEY, entrada TEXT NOT NULL) WITHOUT ROWID")
+        con.execute("CREATE TABLE meta (clave TEXT PRIMARY KEY, valor TEXT NOT NULL)")
+        con.executemany("INSERT INTO datos VALUES (?, ?)",
+                        [(n, json.dumps(e, ensure_ascii=False)) for n, e in datos.items()])
+        con.execute("INSERT INTO meta VALUES ('firma', ?)", (firma,))
+
+def importar_json(ruta_json: str = RUTA_JSON, ruta_db: str = RUTA_DB) -> int:
+    with open(ruta_json, "r", encoding="utf-8") as f:
+        datos = json.load(f)
+    return importar(datos, ruta_db, _firma(ruta_json))
+
+def almacen_vigente(ruta_json: str = RUTA_JSON, ruta_db: str = RUTA_DB) -> bool:
+    """True si el SQLite existe y se construyó a partir del JSON actual."""
+    if not os.path.exists(ruta_db):
+        return False
+    if not os.path.exists(ruta_json):
+        return True
+    try:
+        con = sqlite3.connect(f"file:{ruta_db}?mode=ro", uri=True)
+        try:
+            fila = con.execute("SELECT valor FROM meta WHERE clave = 'firma'").fetchone()
+        finally:
+            con.close()
+    except sqlite3.DatabaseError:
+        return False
+    return bool(fila) and fila[0] == _firma(ruta_json)
+
+class BaseConocimiento:
+    """Consulta por nombre (en minúsculas) sobre el almacén SQLite, con LRU acotado."""
+
+    def __init__(self, ruta_db: str = RUTA_DB, tam_lru: int = TAM_LRU, con: sqlite3.Connection = None):
+        self.ruta_db = ruta_db
+        self._pid = os.getpid()
+        self._con = con or sqlite3.connect(f"file:{ruta_db}?mode=ro", uri=True, check_same_thread=False)
+        # La mayoría de los nombres no tiene datos específicos: el conjunto de claves
+        # evita una consulta por cada uno de ellos.
+        self._claves = frozenset(n for (n,) in self._con.execute("SELECT nombre FROM datos"))
+        self._consultar_lru = lru_cache(maxsize=tam_lru)(self._consultar)
+
+    def obtener(self, clave: str) -> Optional[Dict]:
+        if clave not in self._claves:
+            return None
+        return self._consultar_lru(clave)
+
+    def _consultar(self, clave: str) -> Optional[Dict]:
+        fila = self._con.execute("SELECT entrada FROM datos WHERE nombre = ?", (clave,)).fetchone()
+        return json.loads(fila[0]) if fila else None
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+    def cerrar(self) -> None:
+        self._con.close()
+
+    @classmethod
+    def en_memoria(cls, ruta_json: str = RUTA_JSON, tam_lru: int = TAM_LRU) -> "BaseConocimiento":
+        """Base sobre un SQLite en memoria cargado desde el JSON (sin tocar el disco)."""
+        with open(ruta_json, "r", encoding="utf-8") as f:
+            datos = json.load(f)
+        _comprobar(datos)
+        con = sqlite3.connect(":memory:", check_same_thread=False)
+        _volcar(con, datos, _firma(ruta_json))
+        return cls(":memory:", tam_lru, con)
+
+def ruta_cache() -> str:
+    """Almacén en la caché del usuario, uno por copia del proyecto (cada una tiene su JSON)."""
+    raiz = (os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    copia = hashlib.sha1(BASE_DIR.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(raiz, "nombres", f"datos_especificos-{copia}.sqlite")
+
+def _abrir_base() -> BaseConocimiento:
+    for ruta_db in (RUTA_DB, ruta_cache()):
+        if almacen_vigente(ruta_db=ruta_db):
+            return BaseConocimiento(ruta_db)
+        try:
+            os.makedirs(os.path.dirname(ruta_db), exist_ok=True)
+            importar_json(ruta_db=ruta_db)
+            return BaseConocimiento(ruta_db)
+        except (OSError, sqlite3.Error):
+            continue  # carpeta de solo lectura: probamos el siguiente lugar
+    return BaseConocimiento.en_memoria()
+
+_base = None
+
+def base_por_defecto() -> BaseConocimiento:
+    """
+    Base compartida del proceso. Se (re)construye desde el JSON si hace falta (junto al
+    módulo, si no en ruta_cache(), si no en memoria) y se reabre tras un fork: las
+    conexiones SQLite no deben cruzar procesos.
+    """
+    global _base
+    if _base is None or _base._pid != os.getpid():
+        _base = _abrir_base()
+    return _base
+
+def obtener(clave: str) -> Optional[Dict]:
+    """Entrada de un nombre (clave en minúsculas) o None si no tiene datos específicos."""
+    return base_por_defecto().obtener(clave)
+
+def main():
+    ap = argparse.ArgumentParser(description="Base de conocimiento de nombres específicos.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_imp = sub.add_parser("importar", help="Valida el JSON y construye el almacén SQLite.")
+    p_imp.add_argument("--desde", default=RUTA_JSON, help="JSON fuente (default: datos_especificos.json).")
+    p_imp.add_argument("--db", default=RUTA_DB, help="SQLite de salida (default: datos_especificos.sqlite).")
+    p_val = sub.add_parser("validar", help="Solo valida el JSON fuente.")
+    p_val.add_argument("--desde", default=RUTA_JSON, help="JSON fuente (default: datos_especificos.json).")
+    p_ver = sub.add_parser("ver", help="Muestra la entrada de un nombre.")
+    p_ver.add_argument("nombre")
+    args = ap.parse_args()
+
+    if args.cmd == "importar":
+        try:
+            n = importar_json(args.desde, args.db)
+        except ValueError as e:
+            print(f"⚠️ {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"📚 {n} entradas importadas en {os.path.abspath(args.db)}")
+    elif args.cmd == "validar":
+        with open(args.desde, "r", encoding="utf-8") as f:
+            errores = validar(json.load(f))
+        for e in errores:
+            print(f"  ⚠️ {e}", file=sys.stderr)
+        print(f"{'❌' if errores else '✅'} {len(errores)} problema(s) en {args.desde}")
+        sys.exit(1 if errores else 0)
+    else:
+        entrada = obtener(args.nombre.lower())
+        if entrada is None:
+            print(f"(sin datos específicos para {args.nombre})")
+            sys.exit(1)
+        print(json.dumps(entrada, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks de los puntos calientes del pipeline de nombres.
+
+Casos (cada uno a 3k, 30k y 300k filas de un CSV sintético):
+- calcular_numerologia       (con la memoización vacía)
+- make_key / strip_accents
+- procesar_fila
+- dedupe                     (deduplicar sobre bloques JSONL con ~10% de repetidos)
+- estadisticas               (agregar_archivo sobre el resultado)
+- tabla_compacta             (cargar el resultado en una TablaNombres y agregar_tabla)
+- pipeline                   (pipeline_nombres: generar -> deduplicar_tabla -> agregar_tabla, de punta a punta)
+
+Para cada caso se informa el tiempo (mejor de N repeticiones), el rendimiento en
+filas/s y el pico de memoria de Python (tracemalloc, en una pasada aparte para no
+contaminar los tiempos). Los resultados se guardan en JSON.
+
+Uso:
+  py benchmark_nombres.py csv --filas 30000 --out sintetico_30k.csv
+  py benchmark_nombres.py run --out bench_actual.json [--tamanos 3000 30000] [--casos procesar_fila dedupe]
+  py benchmark_nombres.py comparar bench_base.json bench_actual.json [--tolerancia 0.10]
+"""
+
+import argparse, csv, datetime, json, os, platform, random, sys, tempfile, time, tracemalloc
+from typing import Callable, Dict, List
+
+import estadisticas_nombres
+import generador_nombres
+import pipeline_nombres
+from indice_busqueda import nombres_sinteticos
+from registros_io import EscritorRegistros
+from tabla_nombres import cargar
+from unir_json_nombres_dedupe import deduplicar, deduplicar_tabla, make_key
+
+TAMANOS = (3_000, 30_000, 300_000)
+ORIGENES = ["Griego", "Latín", "Hebreo", "Árabe", "Germánico", "Celta", "Japonés", "Vasco",
+            "Inglés", "Francés", "Italiano", "Escandinavo", "Chino"]
+GENEROS = ["M", "F", "U"]
+TOLERANCIA = 0.10
+
+def escribir_csv_sintetico(ruta: str, filas: int, seed: int = 1, duplicados: float = 0.1) -> None:
+    """CSV Nombre,Género,Origen,Significado con ~`duplicados` de nombres repetidos."""
+    rng = random.Random(seed)
+    unicos = nombres_sinteticos(max(1, int(filas * (1 - duplicados))), seed)
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["Nombre", "Género", "Origen", "Significado"])
+        for i in range(filas):
+            rec = unicos[i] if i < len(unicos) else rng.choice(unicos)
+            w.writerow([rec["nombre"], rng.choice(GENEROS), rng.choice(ORIGENES),
+                        "Significado sintético;\nsegunda línea para probar campos multilínea."])
+
+def _leer_csv(ruta: str) -> List[Dict]:
+    with open(ruta, "r", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+class Entorno:
+    """Archivos de entrada por tamaño, generados una sola vez por corrida."""
+
+    def __init__(self, tmp: str):
+        self.tmp = tmp
+        self._filas = {}
+
+    def csv(self, n: int) -> str:
+        ruta = os.path.join(self.tmp, f"sintetico_{n}.csv")
+        if not os.path.exists(ruta):
+            escribir_csv_sintetico(ruta, n)
+        return ruta
+
+    def filas(self, n: int) -> List[Dict]:
+        if n not in self._filas:
+            self._filas[n] = _leer_csv(self.csv(n))
+        return self._filas[n]
+
+    def bloques(self, n: int, tam: int = 1000) -> List[str]:
+        """Bloques JSONL generados con semilla por nombre (entrada de dedupe)."""
+        rutas = []
+        filas = self.filas(n)
+        for i in range(0, len(filas), tam):
+            ruta = os.path.join(self.tmp, f"bloque_{n}_{i:07d}.jsonl")
+            if not os.path.exists(ruta):
+                with EscritorRegistros(ruta) as w:
+                    for item in generador_nombres.generar_lote(filas[i:i + tam], [], seed=1):
+                        w.escribir(item)
+            rutas.append(ruta)
+        return rutas
+
+    def fusionado(self, n: int) -> str:
+        ruta = os.path.join(self.tmp, f"fusionado_{n}.jsonl")
+        if not os.path.exists(ruta):
+            clave = lambda rec: make_key(rec, "nombre", False, False)
+            with EscritorRegistros(ruta) as w:
+                deduplicar(self.bloques(n), w, clave)
+        return ruta
+
+# --- Casos: cada uno recibe (entorno, n) y devuelve una función sin argumentos
+# --- que ejecuta el trabajo medido y devuelve cuántas filas procesó.
+
+def caso_numerologia(env: Entorno, n: int) -> Callable[[], int]:
+    nombres = [r["Nombre"] for r in env.filas(n)]
+    def correr():
+        generador_nombres._numerologia_normalizada.cache_clear()
+        for nombre in nombres:
+            generador_nombres.calcular_numerologia(nombre)
+        return len(nombres)
+    return correr
+
+def caso_make_key(env: Entorno, n: int) -> Callable[[], int]:
+    recs = [{"nombre": r["Nombre"]} for r in env.filas(n)]
+    def correr():
+        for rec in recs:
+            make_key(rec, "nombre", False, False)
+        return len(recs)
+    return correr
+
+def caso_procesar_fila(env: Entorno, n: int) -> Callable[[], int]:
+    filas = env.filas(n)
+    def correr():
+        generador_nombres.random.seed(1)
+        for row in filas:
+            generador_nombres.procesar_fila(row, [])
+        return len(filas)
+    return correr
+
+def caso_dedupe(env: Entorno, n: int) -> Callable[[], int]:
+    bloques = env.bloques(n)
+    salida = os.path.join(env.tmp, f"dedupe_{n}.jsonl")
+    clave = lambda rec: make_key(rec, "nombre", False, False)
+    def correr():
+        with EscritorRegistros(salida) as w:
+            total, _ = deduplicar(bloques, w, clave)
+        return total
+    return correr
+
+def caso_estadisticas(env: Entorno, n: int) -> Callable[[], int]:
+    ruta = env.fusionado(n)
+    def correr():
+        return estadisticas_nombres.agregar_archivo(ruta)["total"]
+    return correr
+
+def caso_tabla_compacta(env: Entorno, n: int) -> Callable[[], int]:
+    ruta = env.fusionado(n)
+    def correr():
+        return estadisticas_nombres.agregar_tabla(cargar([ruta]))["total"]
+    return correr
+
+def caso_pipeline(env: Entorno, n: int, tam: int = 1000) -> Callable[[], int]:
+    # Las mismas funciones que pipeline_nombres.main(). La generación corre en un pool de
+    # procesos, así que el pico de tracemalloc solo cuenta la tabla y lo que sigue.
+    ruta_csv = env.csv(n)
+    final = os.path.join(env.tmp, f"pipeline_final_{n}.jsonl")
+    clave = lambda rec: make_key(rec, "nombre", False, False)
+    def correr():
+        tabla = pipeline_nombres.generar(ruta_csv, tam, -(-n // tam), 1, [])
+        idx_by_key = {}
+        with EscritorRegistros(final) as w:
+            deduplicar_tabla(tabla, w, clave, idx_by_key=idx_by_key)
+        estadisticas_nombres.agregar_tabla(tabla, indices=sorted(idx_by_key.values()))
+        return len(tabla)
+    return correr
+
+CASOS = {
+    "calcular_numerologia": caso_numerologia,
+    "make_key": caso_make_key,
+    "procesar_fila": caso_procesar_fila,
+    "dedupe": caso_dedupe,
+    "estadisticas": caso_estadisticas,
+    "tabla_compacta": caso_tabla_compacta,
+    "pipeline": caso_pipeline,
+}
+
+def medir(correr: Callable[[], int], repeticiones: int) -> Dict:
+    tiempos, filas = [], 0
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        filas = correr()
+        tiempos.append(time.perf_counter() - t)
+    tracemalloc.start()
+    correr()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    mejor = min(tiempos)
+    return {"filas": filas, "segundos": round(mejor, 6),
+            "filas_por_seg": round(filas / mejor, 1) if mejor else None,
+            "pico_mb": round(pico / 2**20, 3)}
+
+def correr_suite(casos: List[str], tamanos: List[int], repeticiones: int, log=print) -> Dict:
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix="bench-nombres-") as tmp:
+        env = Entorno(tmp)
+        for n in tamanos:
+            for nombre in casos:
+                correr = CASOS[nombre](env, n)
+                # Los tamaños grandes tardan: una repetición basta para que el ruido sea bajo.
+                r = medir(correr, repeticiones if n <= 30_000 else 1)
+                r.update({"caso": nombre, "tamano": n})
+                resultados.append(r)
+                log(f"  {nombre:<22} {n:>8}  {r['segundos']:>9.4f} s  "
+                    f"{r['filas_por_seg']:>12,.0f} filas/s  {r['pico_mb']:>8.2f} MB")
+    return {
+        "meta": {"fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "plataforma": platform.platform(),
+                 "repeticiones": repeticiones},
+        "resultados": resultados,
+    }
+
+def comparar(base: Dict, actual: Dict, tolerancia: float = TOLERANCIA) -> List[Dict]:
+    """Casos cuyo rendimiento cayó más de `tolerancia` (fracción) respecto de la base."""
+    previos = {(r["caso"], r["tamano"]): r for r in base["resultados"]}
+    filas = []
+    for r in actual["resultados"]:
+        b = previos.get((r["caso"], r["tamano"]))
+        if not b or not b.get("filas_por_seg") or not r.get("filas_por_seg"):
+            continue
+        cambio = r["filas_por_seg"] / b["filas_por_seg"] - 1
+        filas.append({"caso": r["caso"], "tamano": r["tamano"], "base": b["filas_por_seg"],
+                      "actual": r["filas_por_seg"], "cambio": round(cambio, 4),
+                      "regresion": cambio < -tolerancia})
+    return filas
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmarks del pipeline de nombres.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_csv = sub.add_parser("csv", help="Escribe un CSV sintético de nombres.")
+    p_csv.add_argument("--filas", type=int, required=True)
+    p_csv.add_argument("--out", required=True)
+    p_csv.add_argument("--seed", type=int, default=1)
+    p_run = sub.add_parser("run", help="Corre la suite y guarda los resultados en JSON.")
+    p_run.add_argument("--out", required=True, help="JSON de resultados.")
+    p_run.add_argument("--tamanos", type=int, nargs="+", default=list(TAMANOS))
+    p_run.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS))
+    p_run.add_argument("--repeticiones", type=int, default=3)
+    p_cmp = sub.add_parser("comparar", help="Compara contra una base y marca las regresiones.")
+    p_cmp.add_argument("base")
+    p_cmp.add_argument("actual")
+    p_cmp.add_argument("--tolerancia", type=float, default=TOLERANCIA,
+                       help=f"Caída de rendimiento tolerada, en fracción (default: {TOLERANCIA}).")
+    args = ap.parse_args()
+
+    if args.cmd == "csv":
+        escribir_csv_sintetico(args.out, args.filas, args.seed)
+        print(f"🧪 CSV sintético de {args.filas} filas en {os.path.abspath(args.out)}")
+    elif args.cmd == "run":
+        print(f"⏱️ Benchmarks: {', '.join(args.casos)} con {args.tamanos} filas")
+        res = correr_suite(args.casos, args.tamanos, args.repeticiones)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(res, f, ensure_ascii=False, indent=2)
+        print(f"💾 Resultados en {os.path.abspath(args.out)}")
+    else:
+        with open(args.base, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.actual, "r", encoding="utf-8") as f:
+            actual = json.load(f)
+        filas = comparar(base, actual, args.tolerancia)
+        for c in filas:
+            marca = "🔴" if c["regresion"] else "🟢"
+            print(f"{marca} {c['caso']:<22} {c['tamano']:>8}  {c['base']:>12,.0f} -> "
+                  f"{c['actual']:>12,.0f} filas/s  ({c['cambio']:+.1%})")
+        regresiones = [c for c in filas if c["regresion"]]
+        print(f"\n{len(regresiones)} regresión(es) con tolerancia {args.tolerancia:.0%}")
+        sys.exit(1 if regresiones else 0)
+
+if __name__ == "__main__":
+    main()
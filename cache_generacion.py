@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Caché en disco (SQLite) de entradas generadas, direccionada por contenido.
+
+La clave es un hash de todo lo que determina una entrada (nombre, género, origen,
+semilla, tipos preferidos y la huella de plantillas/datos específicos que usó),
+así que una entrada solo se reutiliza si regenerarla daría exactamente lo mismo.
+
+- Tamaño acotado: al cerrar se desalojan las entradas usadas hace más tiempo (LRU).
+- Las escrituras se agrupan y se vuelcan al cerrar, en una sola transacción corta,
+  para que varios procesos del pool puedan compartir el mismo archivo.
+- Estadísticas: aciertos, fallos y desalojos.
+
+Uso:
+    with CacheGeneracion("cache_generacion.sqlite", max_entradas=100000) as cache:
+        item = cache.obtener(clave)
+        if item is None:
+            item = generar(...)
+            cache.guardar(clave, item)
+"""
+
+import json, sqlite3, time
+from typing import Dict, Optional
+
+MAX_ENTRADAS = 100_000
+
+class CacheGeneracion:
+    def __init__(self, ruta: str, max_entradas: int = MAX_ENTRADAS):
+        self.ruta = ruta
+        self.max_entradas = max_entradas
+        self.aciertos = self.fallos = self.desalojos = 0
+        self._usadas = {}      # clave -> marca de uso (aciertos pendientes de volcar)
+        self._nuevas = {}      # clave -> json (fallos pendientes de volcar)
+        self._con = sqlite3.connect(ruta, timeout=30)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("CREATE TABLE IF NOT EXISTS entradas ("
+                          "clave TEXT PRIMARY KEY, valor TEXT NOT NULL, uso INTEGER NOT NULL)")
+        self._con.execute("CREATE INDEX IF NOT EXISTS entradas_uso ON entradas(uso)")
+        self._con.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cerrar()
+        return False
+
+    def obtener(self, clave: str) -> Optional[Dict]:
+        valor = self._nuevas.get(clave)
+        if valor is None:
+            fila = self._con.execute("SELECT valor FROM entradas WHERE clave = ?", (clave,)).fetchone()
+            valor = fila[0] if fila else None
+        if valor is None:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        self._usadas[clave] = time.time_ns()
+        return json.loads(valor)
+
+    def guardar(self, clave: str, item: Dict) -> None:
+        self._nuevas[clave] = json.dumps(item, ensure_ascii=False)
+
+    def volcar(self) -> None:
+        """Escribe las entradas nuevas y las marcas de uso, y desaloja lo que sobre."""
+        ahora = time.time_ns()
+        with self._con:
+            self._con.executemany(
+                "INSERT OR REPLACE INTO entradas (clave, valor, uso) VALUES (?, ?, ?)",
+                [(k, v, ahora) for k, v in self._nuevas.items()])
+            self._con.executemany("UPDATE entradas SET uso = ? WHERE clave = ?",
+                                  [(uso, k) for k, uso in self._usadas.items()])
+            total = self._con.execute("SELECT COUNT(*) FROM entradas").fetchone()[0]
+            sobran = total - self.max_entradas
+            if sobran > 0:
+                cur = self._con.execute(
+                    "DELETE FROM entradas WHERE clave IN "
+                    "(SELECT clave FROM entradas ORDER BY uso ASC LIMIT ?)", (sobran,))
+                self.desalojos += cur.rowcount
+        self._nuevas.clear()
+        self._usadas.clear()
+
+    def cerrar(self) -> None:
+        if self._con is None:
+            return
+        self.volcar()
+        self._con.close()
+        self._con = None
+
+    def estadisticas(self) -> Dict[str, int]:
+        return {"aciertos": self.aciertos, "fallos": self.fallos, "desalojos": self.desalojos}
+
+def sumar_estadisticas(*stats: Dict[str, int]) -> Dict[str, int]:
+    total = {"aciertos": 0, "fallos": 0, "desalojos": 0}
+    for st in stats:
+        for k in total:
+            total[k] += st.get(k, 0)
+    return total
+
+def resumen(stats: Dict[str, int]) -> str:
+    consultas = stats["aciertos"] + stats["fallos"]
+    tasa = (100.0 * stats["aciertos"] / consultas) if consultas else 0.0
+    return (f"🗃️ Caché: {stats['aciertos']} aciertos, {stats['fallos']} fallos, "
+            f"{stats['desalojos']} desalojos ({tasa:.1f}% aciertos)")
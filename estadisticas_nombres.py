@@ -1,35 +1,196 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-Lee el JSON final de nombres y muestra estadísticas rápidas:
+Lee uno o varios JSON/JSONL de nombres y muestra estadísticas rápidas:
 - Total de nombres
 - Conteo por género
 - Conteo por origen (los 20 más frecuentes)
+- Distribución numerológica
+- Distribución de historia.tipo
+- Histograma de longitud del significado (en palabras)
+- Cobertura de la base de conocimiento (datos específicos)
+
+Cada archivo se recorre una sola vez (en streaming si es JSONL) calculando todos
+los agregados; los archivos se reparten entre procesos y los parciales se suman.
+Uso:
+    py estadisticas_nombres.py public/data/nombres_completos.json
+    py estadisticas_nombres.py "public/data/nombres_*.json" --workers 4 --json
 """
 
-import json, argparse, collections
+import json, argparse, collections, re, sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List
+
+import base_conocimiento
+from generador_nombres import calcular_numerologia
+from metricas import Metricas
+from registros_io import leer_registros
+from tabla_nombres import TablaNombres
+from unir_json_nombres import expand_inputs
+
+ANCHO_HISTOGRAMA = 25
+RE_NUMERO = re.compile(r"vibración del número (\d+)")
+AGREGADOS = ("genero", "origen", "numerologia", "tipo", "longitud", "especificos")
+
+def numero_de(rec: Dict) -> int:
+    """Número numerológico: el que figura en el significado o, si no está, el calculado."""
+    return _numero(rec.get("significado"), rec.get("nombre", ""))
+
+def _numero(significado: str, nombre) -> int:
+    m = RE_NUMERO.search(significado or "")
+    if m:
+        return int(m.group(1))
+    return calcular_numerologia(str(nombre))[0]
+
+def agregar_archivo(ruta: str, ancho: int = ANCHO_HISTOGRAMA) -> Dict:
+    """Una sola pasada por el archivo; devuelve los contadores parciales."""
+    return agregar_registros(leer_registros(ruta), ancho)
+
+def agregar_registros(registros: Iterable[Dict], ancho: int = ANCHO_HISTOGRAMA) -> Dict:
+    """Contadores parciales de cualquier iterable de registros (p. ej. ya en memoria)."""
+    parcial = {"total": 0, "errores": []}
+    for k in AGREGADOS:
+        parcial[k] = collections.Counter()
+    try:
+        for d in registros:
+            parcial["total"] += 1
+            if "genero" in d:
+                parcial["genero"][d.get("genero","").upper()] += 1
+            if "origen" in d:
+                parcial["origen"][d.get("origen","").title()] += 1
+            parcial["numerologia"][numero_de(d)] += 1
+            historia = d.get("historia")
+            if isinstance(historia, dict):
+                parcial["tipo"][historia.get("tipo") or ""] += 1
+            palabras = len((d.get("significado") or "").split())
+            parcial["longitud"][palabras // ancho * ancho] += 1
+            nombre = str(d.get("nombre", "")).lower()
+            parcial["especificos"]["con" if base_conocimiento.obtener(nombre) else "sin"] += 1
+    except ValueError as e:
+        parcial["errores"].append(str(e))
+    return parcial
+
+def agregar_tabla(tabla: TablaNombres, ancho: int = ANCHO_HISTOGRAMA, indices: Iterable[int] = None) -> Dict:
+    """
+    Igual que agregar_registros sobre las filas `indices` (todas si es None) de una tabla
+    compacta: los categóricos se cuentan por código y se traducen al final.
+    """
+    parcial = {"total": 0, "errores": []}
+    for k in AGREGADOS:
+        parcial[k] = collections.Counter()
+    codigos = {c: collections.Counter() for c in ("genero", "origen", "tipo")}
+    extras = []
+    for i in (range(len(tabla)) if indices is None else indices):
+        if i in tabla.extras:
+            extras.append(tabla.extras[i])
+            continue
+        parcial["total"] += 1
+        codigos["genero"][tabla.genero[i]] += 1
+        codigos["origen"][tabla.origen[i]] += 1
+        codigos["tipo"][tabla.tipo[i]] += 1
+        nombre, significado = tabla.nombre[i], tabla.significado[i]
+        parcial["numerologia"][_numero(significado, nombre)] += 1
+        parcial["longitud"][len(significado.split()) // ancho * ancho] += 1
+        parcial["especificos"]["con" if base_conocimiento.obtener(nombre.lower()) else "sin"] += 1
+    normalizar = {"genero": str.upper, "origen": str.title, "tipo": lambda t: t or ""}
+    for campo, cuenta in codigos.items():
+        valores = tabla.categorias[campo].valores
+        for c, n in cuenta.items():
+            parcial[campo][normalizar[campo](valores[c])] += n
+    return combinar([parcial, agregar_registros(extras, ancho)]) if extras else parcial
+
+def combinar(parciales: List[Dict]) -> Dict:
+    total = {"total": 0, "errores": []}
+    for k in AGREGADOS:
+        total[k] = collections.Counter()
+    for p in parciales:
+        total["total"] += p["total"]
+        total["errores"].extend(p["errores"])
+        for k in AGREGADOS:
+            total[k].update(p[k])
+    return total
+
+def calcular(rutas: List[str], workers: int = 0, ancho: int = ANCHO_HISTOGRAMA) -> Dict:
+    """Agrega todos los archivos; con más de uno los reparte en un pool de procesos."""
+    if len(rutas) == 1 or workers == 1:
+        return combinar([agregar_archivo(r, ancho) for r in rutas])
+    with ProcessPoolExecutor(max_workers=workers or None) as pool:
+        return combinar(list(pool.map(agregar_archivo, rutas, [ancho] * len(rutas))))
+
+def a_json(st: Dict, ancho: int) -> Dict:
+    return {
+        "total": st["total"],
+        "genero": dict(st["genero"].most_common()),
+        "origen": dict(st["origen"].most_common()),
+        "numerologia": {str(k): v for k, v in sorted(st["numerologia"].items())},
+        "historia_tipo": dict(st["tipo"].most_common()),
+        "significado_palabras": {f"{k}-{k + ancho - 1}": v for k, v in sorted(st["longitud"].items())},
+        "datos_especificos": {"con": st["especificos"]["con"], "sin": st["especificos"]["sin"]},
+        "errores": st["errores"],
+    }
 
 def main():
-    parser = argparse.ArgumentParser(description="Estadísticas rápidas de un JSON de nombres.")
-    parser.add_argument("archivo", help="Ruta al archivo JSON (ej. nombres_completos.json)")
+    parser = argparse.ArgumentParser(description="Estadísticas rápidas de JSON/JSONL de nombres.")
+    parser.add_argument("archivos", nargs="+", help="Rutas o patrones (ej. nombres_completos.json, nombres_*.jsonl)")
+    parser.add_argument("--workers", type=int, default=0, help="Procesos para repartir los archivos (0 = núcleos disponibles).")
+    parser.add_argument("--bucket", type=int, default=ANCHO_HISTOGRAMA,
+                        help=f"Ancho del histograma de longitud, en palabras (default: {ANCHO_HISTOGRAMA}).")
+    parser.add_argument("--json", action="store_true", help="Imprime las estadísticas en JSON.")
+    parser.add_argument("--metrics", default="", help="Escribe métricas por etapa (tiempo, filas/s, bytes, RSS) en este JSON.")
+    parser.add_argument("--profile", default="", help="Perfila la corrida: escribe <base>.prof (cProfile) y <base>.txt.")
     args = parser.parse_args()
+    if args.bucket <= 0:
+        parser.error("--bucket debe ser un entero positivo")
+
+    rutas = expand_inputs(args.archivos, "")
+    if not rutas:
+        print("⚠️ No se encontraron archivos que coincidan.", file=sys.stderr)
+        sys.exit(1)
+    m = Metricas("estadisticas_nombres", activo=bool(args.metrics or args.profile))
+    with m.perfilar(args.profile):
+        with m.etapa("agregar") as e:
+            st = calcular(rutas, args.workers, args.bucket)
+            e.filas = st["total"]
+            e.leyo(*rutas)
+        with m.etapa("salida"):
+            imprimir(st, args)
+    m.guardar(args.metrics)
+
+def imprimir(st: Dict, args) -> None:
+    for e in st["errores"]:
+        print(f"⚠️ {e}", file=sys.stderr)
 
-    with open(args.archivo, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if args.json:
+        print(json.dumps(a_json(st, args.bucket), ensure_ascii=False, indent=2))
+        return
 
-    print(f"📊 Total de entradas: {len(data)}")
+    print(f"📊 Total de entradas: {st['total']}")
 
     # Conteo por género
-    genero = collections.Counter([d.get("genero","").upper() for d in data if "genero" in d])
     print("\n👥 Por género:")
-    for g, c in genero.most_common():
+    for g, c in st["genero"].most_common():
         print(f"  {g or '(vacío)'}: {c}")
 
     # Conteo por origen
-    origen = collections.Counter([d.get("origen","").title() for d in data if "origen" in d])
     print("\n🌍 Orígenes más frecuentes:")
-    for o, c in origen.most_common(20):
+    for o, c in st["origen"].most_common(20):
         print(f"  {o or '(vacío)'}: {c}")
 
+    print("\n🔢 Numerología:")
+    for n, c in sorted(st["numerologia"].items()):
+        print(f"  {n}: {c}")
+
+    print("\n📖 Tipo de historia:")
+    for t, c in st["tipo"].most_common():
+        print(f"  {t or '(vacío)'}: {c}")
+
+    print("\n📏 Longitud del significado (palabras):")
+    for k, c in sorted(st["longitud"].items()):
+        print(f"  {k:>4}-{k + args.bucket - 1:<4} {c}")
+
+    con = st["especificos"]["con"]
+    pct = 100.0 * con / st["total"] if st["total"] else 0.0
+    print(f"\n📚 Con datos específicos: {con} de {st['total']} ({pct:.1f}%)")
+
 if __name__ == "__main__":
     main()
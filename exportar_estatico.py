@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exporta el dataset final deduplicado como archivos estáticos partidos por letra
+inicial, para que el cliente descargue y parsee solo la parte que necesita.
+
+- Shards: un JSON compacto por inicial normalizada (strip_accents + minúsculas; Ágata
+  y Ñandú caen en "a" y "n"). Lo que no empieza por a-z va a "otros".
+- Cada archivo (shards y manifiesto) se escribe también precomprimido: .gz siempre
+  (mtime=0, así los bytes no dependen de la hora) y .br si el módulo brotli está
+  instalado (dependencia opcional: pip install brotli).
+- manifiesto.json: total, y por shard archivo, cantidad, tamaños y sha256.
+
+Repetir la exportación con los mismos datos da exactamente los mismos bytes, así
+que los hashes del manifiesto sirven como ETag o para versionar URLs.
+
+Uso:
+  py exportar_estatico.py --out public/data/nombres public/data/nombres_completos.json
+"""
+
+import argparse, gzip, hashlib, json, os, sys
+from contextlib import ExitStack
+from typing import Dict, Iterable
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional: sin ella solo se escriben los .gz
+    brotli = None
+
+from registros_io import EscritorRegistros, leer_registros, reemplazar_directorio
+from unir_json_nombres_dedupe import normalizar
+
+MANIFIESTO = "manifiesto.json"
+OTROS = "otros"
+VERSION = 1
+
+def letra_inicial(nombre) -> str:
+    """Inicial normalizada de un nombre: a-z, u "otros"."""
+    if not isinstance(nombre, str):
+        nombre = str(nombre)
+    k = normalizar(nombre)[:1]
+    return k if "a" <= k <= "z" else OTROS
+
+def precomprimir(ruta: str) -> Dict:
+    """Escribe ruta.gz (y ruta.br si hay brotli) y devuelve sus tamaños."""
+    with open(ruta, "rb") as f:
+        datos = f.read()
+    info = {"bytes": len(datos), "sha256": hashlib.sha256(datos).hexdigest()}
+    variantes = [("gzip", ".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variantes.append(("br", ".br", lambda d: brotli.compress(d, quality=11)))
+    for clave, ext, comprimir in variantes:
+        with open(ruta + ext, "wb") as f:
+            f.write(comprimir(datos))
+        info[clave] = {"archivo": os.path.basename(ruta) + ext, "bytes": os.path.getsize(ruta + ext)}
+    return info
+
+def exportar(registros: Iterable[Dict], out_dir: str, entradas: Iterable[str] = ()) -> Dict:
+    """
+    Escribe shards, manifiesto y sus versiones comprimidas en out_dir (se reemplaza entero).
+    Los registros conservan su orden dentro de cada shard. Devuelve el manifiesto.
+    Lanza ValueError si out_dir no es una exportación anterior (o está vacía) o si
+    contiene alguno de los archivos de `entradas`.
+    """
+    escritores = {}
+    manifiesto = {"version": VERSION, "total": 0, "shards": {}}
+    with reemplazar_directorio(out_dir, MANIFIESTO, entradas, ".exportar-") as tmp:
+        with ExitStack() as pila:
+            for rec in registros:
+                letra = letra_inicial(rec.get("nombre", ""))
+                w = escritores.get(letra)
+                if w is None:
+                    w = escritores[letra] = pila.enter_context(
+                        EscritorRegistros(os.path.join(tmp, letra + ".json"), "json", compacto=True))
+                w.escribir(rec)
+
+        for letra in sorted(escritores):
+            info = {"archivo": letra + ".json", "total": escritores[letra].total}
+            info.update(precomprimir(os.path.join(tmp, info["archivo"])))
+            manifiesto["shards"][letra] = info
+            manifiesto["total"] += info["total"]
+        with open(os.path.join(tmp, MANIFIESTO), "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f, ensure_ascii=False, indent=2, sort_keys=True)
+        precomprimir(os.path.join(tmp, MANIFIESTO))
+    return manifiesto
+
+def main():
+    ap = argparse.ArgumentParser(description="Exporta el dataset en shards por inicial, precomprimidos (gzip/brotli).")
+    ap.add_argument("--out", required=True,
+                    help="Carpeta de salida; se reemplaza entera, así que debe estar vacía o ser una exportación anterior.")
+    ap.add_argument("archivos", nargs="+", help="JSON/JSONL deduplicados de entrada.")
+    args = ap.parse_args()
+
+    if brotli is None:
+        print("⚠️ brotli no está instalado: solo se escriben los .gz (pip install brotli).", file=sys.stderr)
+    registros = (rec for ruta in args.archivos for rec in leer_registros(ruta))
+    try:
+        m = exportar(registros, args.out, args.archivos)
+    except ValueError as e:
+        ap.error(str(e))
+    crudo = sum(s["bytes"] for s in m["shards"].values())
+    gz = sum(s["gzip"]["bytes"] for s in m["shards"].values())
+    print(f"📦 {m['total']} nombres en {len(m['shards'])} shards → {os.path.abspath(args.out)}")
+    print(f"   {crudo:,} bytes sin comprimir, {gz:,} con gzip")
+
+if __name__ == "__main__":
+    main()
@@ -4,75 +4,52 @@
 Genera significados (15–20 palabras) y micro-relatos (60–100 palabras) por nombre.
 Entrada: CSV con columnas: Nombre,Genero,Origen
 Salida: JSON: nombre, genero, origen, significado, historia:{tipo,relato}
+        (lista indentada, o JSONL con --format jsonl / extensión .jsonl; los registros
+        se escriben a medida que se generan)
 
 Uso por bloques:
   python generador_nombres.py --in maestros.csv --out nombres_001_100.json --skip 0   --max 100 --seed 11
   python generador_nombres.py --in maestros.csv --out nombres_101_200.json --skip 100 --max 100 --seed 12
+
+Varios bloques en un solo proceso (reparte los bloques en un pool de procesos;
+el bloque i usa la semilla seed+i, igual que las ejecuciones sueltas):
+  python generador_nombres.py --in maestros.csv --out-dir public/data --block-size 100 --blocks 30 --seed 200 --workers 4
+
+Semilla por nombre (--per-name-seed): cada fila usa su propio generador, derivado de
+--seed y del nombre normalizado, así que el texto es el mismo sin importar el bloque,
+el orden del CSV o el número de procesos.
+
+Caché (--cache archivo.sqlite, requiere --per-name-seed): reutiliza las entradas cuyas
+entradas (nombre, género, origen, semilla, tipos y huella de plantillas/datos) no cambiaron.
+
+Modo servidor (--serve PUERTO): proceso persistente que responde por HTTP entradas por
+nombre o por lotes, con semilla por nombre y caché LRU en memoria (ver servidor_nombres.py):
+  python generador_nombres.py --serve 8765 --seed 42
 """
 
-import csv, json, random, argparse
-from typing import List, Dict
+import csv, hashlib, json, os, random, argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List
+
+import base_conocimiento
+import indice_csv
+from cache_generacion import CacheGeneracion, MAX_ENTRADAS, resumen, sumar_estadisticas
+from metricas import Metricas
+from registros_io import EscritorRegistros, FORMATOS, extension
+from unir_json_nombres_dedupe import normalizar
 
 TIPOS = ["histórica","bíblica","mitológica","poética","fantástica"]
+MAPA_TIPOS = {"historica":"histórica","biblica":"bíblica","mitologica":"mitológica","poetica":"poética","fantastica":"fantástica"}
 RASGOS1 = ["valentía","sabiduría","protección","alegría","resiliencia","claridad","creatividad","fortaleza interior","templanza","curiosidad"]
 RASGOS2 = ["empático","leal","visionario","protector","inspirador","honesto","sereno","disciplinado","compasivo","observador"]
 IMPULSOS = ["liderazgo consciente","búsqueda de verdad","cuidado de los demás","crecimiento personal","sueños grandes","decisiones justas","aprendizaje continuo","servicio generoso"]
 REFLEJOS = ["luz espiritual","equilibrio emocional","disciplina práctica","imaginación fértil","bondad auténtica","esperanza activa","pensamiento crítico","gracia bajo presión"]
 
-# Base de conocimiento enriquecida para nombres específicos.
-DATOS_ESPECIFICOS = {
-    "alejandro": {
-        "etimologia": "Proviene del griego 'Alexandros' (Αλέξανδρος), compuesto por 'alexo' (proteger, defender) y 'andros' (hombre). Su significado es 'el que protege al hombre' o 'el defensor de la humanidad'.",
-        "variantes": ["Alex, Sandro, Lisandro"],
-        "personajes": [
-            "Alejandro Magno, rey de Macedonia, cuya visión y conquistas extendieron la cultura helenística, redefiniendo el mundo antiguo.",
-            "Varios papas y santos han llevado este nombre, como San Alejandro de Alejandría, clave en los primeros concilios de la Iglesia."
-        ],
-        "simbolismo": "Evoca liderazgo, ambición y la capacidad de crear imperios, tanto externos como internos. Es un nombre ligado a la estrategia y a la expansión de horizontes.",
-        "relato_personalizado": "Su legado, como el del gran conquistador, evoca la capacidad de unir mundos y expandir horizontes. Quien lleva este nombre aprende que la verdadera fuerza no está en la espada, sino en la visión para proteger y guiar a su gente."
-    },
-    "cesar": {
-        "etimologia": "Originado en el latín 'Caesar', cognomen de una ilustre familia romana. Su etimología es incierta; podría derivar de 'caesaries' (cabellera) o 'caedere' (cortar), en alusión a un ancestro nacido por cesárea.",
-        "variantes": ["Cesarino"],
-        "personajes": [
-            "Julio César, general y estadista romano cuya vida y muerte marcaron el fin de la República y el inicio del Imperio. Su nombre se convirtió en sinónimo de 'emperador' (Káiser, Zar).",
-            "César Chávez, líder campesino y activista por los derechos civiles en Estados Unidos."
-        ],
-        "simbolismo": "Representa la autoridad, el poder de decisión y la capacidad de transformar la sociedad. Es un nombre que porta el peso de la historia y la determinación.",
-        "relato_personalizado": "El nombre resuena con el poder y la autoridad del líder romano que transformó la historia. Quien lo lleva hereda un eco de mando, estrategia y la audacia de cruzar cualquier Rubicón personal."
-    },
-    "margarita": {
-        "etimologia": "Del griego 'margarites' (μαργαρίτης), que significa 'perla'. A través del latín, se asoció también a la flor homónima.",
-        "variantes": ["Rita, Marga, Greta"],
-        "personajes": [
-            "Santa Margarita de Antioquía, una de las santas más populares de la Edad Media, patrona de las parturientas.",
-            "Margarita de Valois, reina de Francia y Navarra, conocida como la 'Reina Margot', figura clave en las guerras de religión."
-        ],
-        "simbolismo": "Simboliza la pureza, la belleza oculta y la inocencia (como la perla dentro de la ostra y la flor de pétalos blancos). También se asocia con la isla de Margarita, conocida como la 'Perla del Caribe'.",
-        "relato_personalizado": "Como la perla que le da nombre y la flor que inspira leyendas, Margarita evoca una belleza que se forma en la adversidad. Su significado se despliega en pétalos de sencillez y en el tesoro de una resiliencia luminosa."
-    },
-    "rosa": {
-        "etimologia": "Directamente del latín 'rosa', nombre de la flor, que a su vez podría tener raíces en el persa antiguo.",
-        "variantes": ["Rosalía, Rosario, Rosana"],
-        "personajes": [
-            "Santa Rosa de Lima, mística y primera santa de América.",
-            "Rosa Parks, figura icónica del movimiento por los derechos civiles en Estados Unidos.",
-            "En el esoterismo, la rosa es un símbolo central en el Rosacrucismo, representando el alma que florece en el centro de la cruz de la materia."
-        ],
-        "simbolismo": "Es el arquetipo de la belleza, el amor y la pasión. Sus espinas añaden el matiz de la protección y el sacrificio. Simboliza el misterio revelado y la perfección espiritual.",
-        "relato_personalizado": "Más que una flor, es un símbolo universal de amor, pasión y misterio. El nombre Rosa guarda el secreto de una belleza que se defiende con espinas pero se entrega en su fragancia, un equilibrio entre delicadeza y fortaleza."
-    },
-    "berna": {
-        "etimologia": "Principalmente un hipocorístico de Bernarda o Bernardo, de origen germánico ('berin-hard'), que significa 'fuerte como un oso'. También es el nombre de la capital de Suiza, cuya leyenda fundacional involucra a un oso.",
-        "variantes": ["Bernardita, Bernardo"],
-        "personajes": [
-            "Santa Bernardita Soubirous, la vidente de Lourdes, cuyo nombre en su forma completa era Bernarde-Marie.",
-            "Berna González Harbour, periodista y escritora española."
-        ],
-        "simbolismo": "Combina la fuerza y la valentía del oso con la solidez y la diplomacia de la ciudad suiza. Es un nombre que evoca protección, resistencia y un carácter firme.",
-        "relato_personalizado": "Con la fuerza del oso y la solidez de la ciudad que nombra, Berna es un topónimo hecho persona. Simboliza un refugio de poder, una capital de carácter firme y un corazón que protege su territorio con lealtad."
-    }
-}
+# Base de conocimiento enriquecida para nombres específicos: vive en datos_especificos.json
+# y se consulta entrada a entrada a través de base_conocimiento (SQLite + LRU).
 
 RELATOS_PLANTILLAS = {
     "bíblica": (
@@ -121,66 +98,120 @@ NUMEROLOGIA_SIGNIFICADOS = {
     9: "Humanitarismo, compasión y finalización. Es el número del idealista y el filántropo. Tiene una visión global y un profundo amor por la humanidad. Su misión es servir desinteresadamente y cerrar ciclos."
 }
 
-def _pal(lista): return random.choice(lista)
+def _pal(lista, rng=random): return rng.choice(lista)
+
+def tipos_preferidos(tipos: Iterable[str]) -> List[str]:
+    """Tipos de --types (con o sin tilde) a los de TIPOS; los desconocidos se ignoran."""
+    return [MAPA_TIPOS.get(t.lower(), t) for t in tipos if MAPA_TIPOS.get(t.lower(), t) in TIPOS]
+
+def rng_para_nombre(seed: int, nombre: str) -> random.Random:
+    """
+    Generador propio de un nombre, derivado de la semilla de la corrida y del nombre
+    normalizado. El texto de un nombre deja de depender del bloque y de su posición.
+    """
+    h = hashlib.sha256(f"{seed}:{normalizar(nombre)}".encode("utf-8")).digest()
+    return random.Random(int.from_bytes(h[:8], "big"))
+
+# --- Motor precompilado -------------------------------------------------------
+# Todo lo que no depende del nombre se prepara una sola vez al importar el módulo.
+
+# Súbela si cambian la lógica o los textos fijos de generar_descripcion_completa/elegir_tipo:
+# forma parte de la huella de la caché y la invalida.
+VERSION_MOTOR = 1
+
+# Plantillas con los espacios ya normalizados y partidas en torno a {nombre}:
+# el relato es nombre.join(partes), sin str.format ni split/join del texto completo.
+PLANTILLAS_COMPILADAS = {tipo: " ".join(plantilla.split()).split("{nombre}")
+                         for tipo, plantilla in RELATOS_PLANTILLAS.items()}
+
+# Valor pitagórico de cada letra (en minúsculas).
+VALORES_LETRAS = {
+    'a': 1, 'j': 1, 's': 1, 'á': 1, 'à': 1, 'ä': 1,
+    'b': 2, 'k': 2, 't': 2,
+    'c': 3, 'l': 3, 'u': 3, 'ú': 3, 'ü': 3,
+    'd': 4, 'm': 4, 'v': 4,
+    'e': 5, 'n': 5, 'w': 5, 'é': 5, 'è': 5, 'ë': 5, 'ñ': 5,
+    'f': 6, 'o': 6, 'x': 6, 'ó': 6, 'ò': 6, 'ö': 6,
+    'g': 7, 'p': 7, 'y': 7,
+    'h': 8, 'q': 8, 'z': 8,
+    'i': 9, 'r': 9, 'í': 9, 'ì': 9, 'ï': 9
+}
+NUMEROS_MAESTROS = (11, 22, 33)
+
+@lru_cache(maxsize=65536)
+def _numerologia_normalizada(nombre_lower: str) -> tuple:
+    valor = sum(VALORES_LETRAS.get(letra, 0) for letra in nombre_lower)
+    # Reducción a un solo dígito (se respetan los números maestros)
+    while valor > 9 and valor not in NUMEROS_MAESTROS:
+        suma = 0
+        while valor:
+            valor, digito = divmod(valor, 10)
+            suma += digito
+        valor = suma
+    return valor, NUMEROLOGIA_SIGNIFICADOS.get(valor, "Significado no disponible.")
+
+@lru_cache(maxsize=base_conocimiento.TAM_LRU)
+def _parrafos_especificos(clave: str) -> tuple:
+    """Párrafos 1 y 2 de un nombre con datos específicos (no usan azar)."""
+    info = base_conocimiento.obtener(clave)
+    p1 = info['etimologia']
+    if 'variantes' in info and info['variantes']:
+        p1 += f" Algunas de sus variantes son {', '.join(info['variantes'])}."
+    if 'simbolismo' in info:
+        p1 += f" {info['simbolismo']}"
+    p2 = ""
+    if 'personajes' in info:
+        p2 = "Este nombre ha sido llevado por figuras notables a lo largo de la historia. " + " ".join(info['personajes'])
+    return p1, p2
+
+@lru_cache(maxsize=1)
+def huella_motor() -> str:
+    """Hash de las plantillas y tablas fijas que influyen en el texto generado."""
+    fijo = [VERSION_MOTOR, RELATOS_PLANTILLAS, NUMEROLOGIA_SIGNIFICADOS,
+            TIPOS, RASGOS1, RASGOS2, IMPULSOS, REFLEJOS]
+    return hashlib.sha256(json.dumps(fijo, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+def clave_cache(nombre: str, genero: str, origen: str, seed: int, preferidos: List[str]) -> str:
+    """Clave de caché: hash de las entradas de la fila y de la versión de lo que usa."""
+    datos = [huella_motor(), base_conocimiento.obtener(nombre.lower()),
+             nombre, genero, origen, seed, preferidos]
+    return hashlib.sha256(json.dumps(datos, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
 
 def calcular_numerologia(nombre: str) -> (int, str):
     """Calcula el número numerológico de un nombre (sistema pitagórico)."""
-    tabla = {
-        'a': 1, 'j': 1, 's': 1, 'á': 1, 'à': 1, 'ä': 1,
-        'b': 2, 'k': 2, 't': 2,
-        'c': 3, 'l': 3, 'u': 3, 'ú': 3, 'ü': 3,
-        'd': 4, 'm': 4, 'v': 4,
-        'e': 5, 'n': 5, 'w': 5, 'é': 5, 'è': 5, 'ë': 5, 'ñ': 5,
-        'f': 6, 'o': 6, 'x': 6, 'ó': 6, 'ò': 6, 'ö': 6,
-        'g': 7, 'p': 7, 'y': 7,
-        'h': 8, 'q': 8, 'z': 8,
-        'i': 9, 'r': 9, 'í': 9, 'ì': 9, 'ï': 9
-    }
-    
-    valor_numerico = sum(tabla.get(letra, 0) for letra in nombre.lower())
-    
-    # Reducción a un solo dígito
-    while valor_numerico > 9:
-        if valor_numerico in [11, 22, 33]: # Números maestros (opcional)
-            break
-        valor_numerico = sum(int(digito) for digito in str(valor_numerico))
-        
-    return valor_numerico, NUMEROLOGIA_SIGNIFICADOS.get(valor_numerico, "Significado no disponible.")
-
-def generar_descripcion_completa(nombre: str, origen: str) -> str:
-    """Genera una descripción completa y estructurada del nombre."""
-    info_especifica = DATOS_ESPECIFICOS.get(nombre.lower())
-    
-    # Párrafo 1: Origen y Significado
+    return _numerologia_normalizada(nombre.lower())
+
+def generar_descripcion_completa(nombre: str, origen: str, rng=random) -> str:
+    """Genera una descripción completa y estructurada del nombre. `rng`: generador a usar (default: random global)."""
+    clave = nombre.lower()
+    info_especifica = base_conocimiento.obtener(clave)
+
+    # Párrafos 1 y 2: Origen y Significado, Personajes y Legado
     if info_especifica:
-        p1 = info_especifica['etimologia']
-        if 'variantes' in info_especifica and info_especifica['variantes']:
-            p1 += f" Algunas de sus variantes son {', '.join(info_especifica['variantes'])}."
-        if 'simbolismo' in info_especifica:
-            p1 += f" {info_especifica['simbolismo']}"
+        p1, p2 = _parrafos_especificos(clave)
     else:
-        p1 = f"De origen {origen.lower()}, se asocia a la {_pal(RASGOS1)} y a un carácter {_pal(RASGOS2)}. Refleja un impulso hacia el {_pal(IMPULSOS)}."
+        p1 = f"De origen {origen.lower()}, se asocia a la {_pal(RASGOS1, rng)} y a un carácter {_pal(RASGOS2, rng)}. Refleja un impulso hacia el {_pal(IMPULSOS, rng)}."
 
-    # Párrafo 2: Personajes y Legado
-    p2 = ""
-    if info_especifica and 'personajes' in info_especifica:
-        p2 = "Este nombre ha sido llevado por figuras notables a lo largo de la historia. " + " ".join(info_especifica['personajes'])
-    else:
-        # Párrafo de legado arquetípico para nombres sin datos específicos
-        arquetipos = [
-            f"Portadores de este nombre a menudo se destacan como {_pal(['pioneros', 'guardianes', 'visionarios', 'artistas'])}, dejando una huella de {_pal(['innovación', 'protección', 'creatividad', 'sabiduría'])} en su comunidad.",
-            f"El eco de este nombre resuena en aquellos que buscan la {_pal(['justicia', 'verdad', 'belleza', 'armonía'])}, convirtiéndose en referentes de {_pal(['integridad', 'resiliencia', 'compasión', 'valentía'])}."
-        ]
-        p2 = random.choice(arquetipos)
+    if not info_especifica or 'personajes' not in info_especifica:
+        # Párrafo de legado arquetípico para nombres sin datos específicos.
+        # Se sortean los cuatro huecos y luego el arquetipo, en el mismo orden de siempre.
+        a1 = _pal(['pioneros', 'guardianes', 'visionarios', 'artistas'], rng)
+        a2 = _pal(['innovación', 'protección', 'creatividad', 'sabiduría'], rng)
+        b1 = _pal(['justicia', 'verdad', 'belleza', 'armonía'], rng)
+        b2 = _pal(['integridad', 'resiliencia', 'compasión', 'valentía'], rng)
+        if rng.choice((0, 1)) == 0:
+            p2 = f"Portadores de este nombre a menudo se destacan como {a1}, dejando una huella de {a2} en su comunidad."
+        else:
+            p2 = f"El eco de este nombre resuena en aquellos que buscan la {b1}, convirtiéndose en referentes de {b2}."
 
     # Párrafo 3 y 4: Relatos
     # Usamos el relato personalizado si existe, si no, el genérico.
     if info_especifica and 'relato_personalizado' in info_especifica:
         p3 = info_especifica['relato_personalizado']
-        p4 = generar_relato(nombre, random.choice(["fantástica", "mitológica"])) # Uno específico y otro aleatorio
+        p4 = generar_relato(nombre, rng.choice(["fantástica", "mitológica"])) # Uno específico y otro aleatorio
     else:
         p3 = generar_relato(nombre, "poética")
-        p4 = generar_relato(nombre, random.choice(["histórica", "fantástica", "mitológica"]))
+        p4 = generar_relato(nombre, rng.choice(["histórica", "fantástica", "mitológica"]))
 
     # Párrafo 5: Numerología
     num, sig_num = calcular_numerologia(nombre)
@@ -190,73 +221,255 @@ def generar_descripcion_completa(nombre: str, origen: str) -> str:
     parrafos = [p for p in [p1, p2, p3, p4, p5] if p]
     return "\n\n".join(parrafos)
 
-def elegir_tipo(nombre: str, origen: str, preferidos: List[str]) -> str:
+def elegir_tipo(nombre: str, origen: str, preferidos: List[str], rng=random) -> str:
     lower = nombre.lower()
     if lower in {"josé","jose","maría","maria","mateo","noah","daniel","gabriel","sara","david","isabel","isabella"}:
         return "bíblica"
     if origen.lower() in {"griego","latín","latin","romano"} and lower in {"camila","alejandro","marco","helen","elena"}:
         return "histórica"
     if origen.lower() in {"griego","latín","latin"}:
-        return random.choice(["mitológica","poética"])
+        return rng.choice(["mitológica","poética"])
     if origen.lower() in {"árabe","arabe"} and lower in {"aisha","fatima","omar","youssef","ahmed"}:
         return "histórica"
     if lower in {"yuki","sakura","haru","mei","wei"}:
         return "poética"
     if preferidos:
-        return random.choice(preferidos)
-    return random.choice(TIPOS)
+        return rng.choice(preferidos)
+    return rng.choice(TIPOS)
 
 def generar_relato(nombre: str, tipo: str) -> str:
     """Genera un relato de un tipo específico, usando datos específicos si existen."""
-    plantilla = RELATOS_PLANTILLAS.get(tipo, RELATOS_PLANTILLAS["poética"])
-    return " ".join(plantilla.format(nombre=nombre).split())
+    partes = PLANTILLAS_COMPILADAS.get(tipo, PLANTILLAS_COMPILADAS["poética"])
+    if nombre != " ".join(nombre.split()):
+        # Nombre con espacios irregulares: normalizamos el texto completo como siempre.
+        return " ".join(nombre.join(partes).split())
+    return nombre.join(partes)
 
-def procesar_fila(row: Dict[str,str], preferidos: List[str]) -> Dict:
+def procesar_fila(row: Dict[str,str], preferidos: List[str], seed: int = None,
+                  cache: CacheGeneracion = None) -> Dict:
+    """
+    Genera la entrada de una fila. Con `seed` usa un generador propio del nombre
+    (rng_para_nombre); sin ella, el random global sembrado por bloque de siempre.
+    Con `cache` (requiere `seed`) devuelve la entrada guardada si las entradas no cambiaron.
+    """
     nombre = (row.get("Nombre") or row.get("nombre") or "").strip()
     genero = (row.get("Género") or row.get("Genero") or row.get("genero") or "U").strip()
     origen = (row.get("Origen") or row.get("origen") or "Desconocido").strip()
     if not nombre:
         return None
 
-    descripcion_completa = generar_descripcion_completa(nombre, origen)
-    tipo = elegir_tipo(nombre, origen, preferidos)
+    if cache is not None:
+        # Con el random global el texto depende de la posición en el bloque: no es cacheable.
+        if seed is None:
+            raise ValueError("La caché requiere semilla por nombre (seed).")
+        clave = clave_cache(nombre, genero, origen, seed, preferidos)
+        item = cache.obtener(clave)
+        if item is None:
+            item = procesar_fila(row, preferidos, seed)
+            cache.guardar(clave, item)
+        return item
+
+    rng = random if seed is None else rng_para_nombre(seed, nombre)
+    descripcion_completa = generar_descripcion_completa(nombre, origen, rng)
+    tipo = elegir_tipo(nombre, origen, preferidos, rng)
 
     # El relato ahora está integrado en el significado completo. Usamos el tipo solo para referencia.
     return {"nombre": nombre, "genero": genero, "origen": origen,
             "significado": descripcion_completa, "historia":{"tipo": tipo, "relato": ""}} # El relato ahora está integrado en el significado
 
+def generar_lote(rows: Iterable[Dict[str,str]], preferidos: List[str], seed: int = None,
+                 cache: CacheGeneracion = None) -> Iterator[Dict]:
+    """
+    Procesa un lote de filas con el motor precompilado y produce solo las entradas
+    válidas (las filas sin nombre se descartan), en orden y de forma perezosa.
+    Con `seed`, cada nombre usa su propio generador; con `cache`, solo se calculan
+    los fallos (ver procesar_fila).
+    """
+    for row in rows:
+        item = procesar_fila(row, preferidos, seed, cache)
+        if item:
+            yield item
+
+def _tiene_nombre(row: Dict[str,str]) -> bool:
+    # Mismo criterio que procesar_fila para descartar filas sin nombre.
+    return bool((row.get("Nombre") or row.get("nombre") or "").strip())
+
+def nombre_bloque(skip: int, tam: int, formato: str = "json") -> str:
+    """Nombre de archivo de un bloque, igual que en generar_1_a_3000.ps1 (nombres_001_100.json)."""
+    return f"nombres_{skip + 1:03d}_{skip + tam:03d}{extension(formato)}"
+
+def repartir_bloques(rows: List[Dict[str,str]], tam: int, num_bloques: int) -> List[tuple]:
+    """
+    Devuelve (indice, skip, filas) por bloque. Reproduce la semántica de --skip/--max:
+    el bloque i salta i*tam filas del CSV y toma filas hasta reunir tam nombres válidos.
+    """
+    bloques = []
+    for i in range(num_bloques):
+        ini = i * tam
+        if ini >= len(rows):
+            break
+        fin, validos = ini, 0
+        while fin < len(rows) and validos < tam:
+            if _tiene_nombre(rows[fin]):
+                validos += 1
+            fin += 1
+        bloques.append((i, ini, rows[ini:fin]))
+    return bloques
+
+def generar_bloque(rows: List[Dict[str,str]], preferidos: List[str], seed: int, out_json: str,
+                   formato: str = None, por_nombre: bool = False,
+                   cache_ruta: str = None, cache_max: int = MAX_ENTRADAS) -> tuple:
+    """
+    Genera y escribe un bloque completo. Pensado para ejecutarse en un proceso del pool.
+    Con por_nombre=True la semilla se combina con cada nombre en vez de sembrar el bloque.
+    Devuelve (entradas escritas, estadísticas de caché o None).
+    """
+    random.seed(seed)
+    ctx = CacheGeneracion(cache_ruta, cache_max) if cache_ruta else nullcontext()
+    with ctx as cache, EscritorRegistros(out_json, formato) as w:
+        for item in generar_lote(rows, preferidos, seed if por_nombre else None, cache):
+            w.escribir(item)
+    return w.total, (cache.estadisticas() if cache else None)
+
+def generar_bloques(in_csv: str, out_dir: str, tam: int, num_bloques: int, seed_base: int,
+                    preferidos: List[str], workers: int = 0, formato: str = "json",
+                    por_nombre: bool = False, cache_ruta: str = None,
+                    cache_max: int = MAX_ENTRADAS) -> tuple:
+    """
+    Lee el CSV una sola vez y genera num_bloques archivos nombres_XXX_YYY.json en out_dir,
+    repartidos en un pool de procesos. El bloque i usa la semilla seed_base + i;
+    con por_nombre=True todos usan seed_base combinada con cada nombre.
+    Devuelve ([(ruta, entradas)], estadísticas de caché sumadas o None).
+    """
+    with open(in_csv, "r", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    os.makedirs(out_dir or ".", exist_ok=True)
+
+    bloques = repartir_bloques(rows, tam, num_bloques)
+    rutas = [os.path.join(out_dir, nombre_bloque(skip, tam, formato)) for _, skip, _ in bloques]
+    with ProcessPoolExecutor(max_workers=workers or None) as pool:
+        futuros = [pool.submit(generar_bloque, filas, preferidos, seed_base if por_nombre else seed_base + i,
+                               ruta, formato, por_nombre, cache_ruta, cache_max)
+                   for (i, _, filas), ruta in zip(bloques, rutas)]
+        resultados = [fut.result() for fut in futuros]
+    hechos = [(ruta, n) for ruta, (n, _) in zip(rutas, resultados)]
+    stats = sumar_estadisticas(*(st for _, st in resultados)) if cache_ruta else None
+    return hechos, stats
+
+def leer_filas(in_csv: str, skip: int = 0, usar_indice: bool = True):
+    """Filas del CSV a partir de la número `skip`; con índice hace seek en vez de recorrer."""
+    if skip and usar_indice:
+        yield from indice_csv.leer_desde(in_csv, skip)
+        return
+    with open(in_csv, "r", encoding="utf-8") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            if i >= skip:
+                yield row
+
+def bytes_leidos_csv(in_csv: str, skip: int, filas: int, usar_indice: bool = True) -> int:
+    """
+    Bytes del CSV que consumió leer_filas(in_csv, skip, usar_indice) tras entregar `filas`
+    filas: con índice, la cabecera y las filas desde skip; sin él, todo hasta skip + filas.
+    """
+    if usar_indice or indice_csv.indice_vigente(in_csv):
+        cabecera = indice_csv.offset_fila(in_csv, 0)
+        desde = indice_csv.offset_fila(in_csv, skip) if skip and usar_indice else cabecera
+        return cabecera + indice_csv.offset_fila(in_csv, skip + filas) - desde
+    offsets = indice_csv.calcular_offsets(in_csv)
+    return offsets[min(skip + filas, len(offsets) - 1)]
+
 def main():
     ap = argparse.ArgumentParser(description="Genera significados y relatos para nombres (JSON).")
-    ap.add_argument("--infile", dest="in_csv", required=True, help="CSV de entrada (Nombre,Género,Origen).")
-    ap.add_argument("--out", dest="out_json", required=True, help="JSON de salida.")
+    ap.add_argument("--infile", dest="in_csv", default="", help="CSV de entrada (Nombre,Género,Origen).")
+    ap.add_argument("--out", dest="out_json", default="", help="JSON/JSONL de salida (modo de un solo bloque).")
     ap.add_argument("--max", dest="max_rows", type=int, default=0, help="Filas a procesar (0 = todas).")
     ap.add_argument("--skip", dest="skip_rows", type=int, default=0, help="Filas a saltar desde el inicio.")
-    ap.add_argument("--seed", dest="seed", type=int, default=42, help="Semilla para reproducibilidad.")
+    ap.add_argument("--seed", dest="seed", type=int, default=42, help="Semilla para reproducibilidad (semilla base con --blocks).")
     ap.add_argument("--types", nargs="*", default=[], help="Restringe tipos: historica biblica mitologica poetica fantastica")
+    ap.add_argument("--blocks", dest="num_bloques", type=int, default=0, help="Genera N bloques en un solo proceso (requiere --block-size).")
+    ap.add_argument("--block-size", dest="tam_bloque", type=int, default=0, help="Nombres por bloque en modo --blocks.")
+    ap.add_argument("--workers", type=int, default=0, help="Procesos del pool en modo --blocks (0 = núcleos disponibles).")
+    ap.add_argument("--out-dir", dest="out_dir", default=".", help="Carpeta de salida de los bloques (default: .).")
+    ap.add_argument("--format", dest="formato", choices=FORMATOS, default=None,
+                    help="Formato de salida: json (lista indentada) o jsonl (default: según extensión; json en --blocks).")
+    ap.add_argument("--per-name-seed", dest="por_nombre", action="store_true",
+                    help="Cada nombre usa un generador derivado de --seed y del nombre normalizado: "
+                         "el resultado no depende del bloque, del orden ni del reparto entre procesos.")
+    ap.add_argument("--cache", dest="cache_ruta", default="",
+                    help="Caché SQLite de entradas generadas (requiere --per-name-seed). Ej.: cache_generacion.sqlite")
+    ap.add_argument("--cache-max", dest="cache_max", type=int, default=MAX_ENTRADAS,
+                    help=f"Máximo de entradas en la caché; se desalojan las menos usadas (default: {MAX_ENTRADAS}).")
+    ap.add_argument("--metrics", default="", help="Escribe métricas por etapa (tiempo, filas/s, bytes, RSS) en este JSON.")
+    ap.add_argument("--profile", default="", help="Perfila la corrida: escribe <base>.prof (cProfile) y <base>.txt.")
+    ap.add_argument("--no-index", dest="usar_indice", action="store_false",
+                    help="No usa el índice de offsets <csv>.idx para --skip (recorre el CSV fila por fila).")
+    ap.add_argument("--serve", dest="puerto", type=int, default=0,
+                    help="Modo servidor: atiende HTTP en este puerto con el motor cargado (ver servidor_nombres.py).")
+    ap.add_argument("--host", default="127.0.0.1", help="Dirección del modo servidor (default: 127.0.0.1).")
+    ap.add_argument("--serve-lru", dest="tam_lru", type=int, default=10_000,
+                    help="Entradas de la caché LRU del modo servidor (default: 10000).")
     args = ap.parse_args()
 
+    if args.puerto:
+        # Import diferido: servidor_nombres importa este módulo.
+        import servidor_nombres
+        servidor_nombres.servir(args.host, args.puerto, args.seed, args.types, args.tam_lru)
+        return
+    if not args.in_csv:
+        ap.error("se requiere --infile (salvo en modo --serve)")
+
+    preferidos = tipos_preferidos(args.types)
+
+    if args.cache_ruta and not args.por_nombre:
+        ap.error("--cache requiere --per-name-seed (con la semilla por bloque el texto depende de la posición)")
+
+    if args.num_bloques and args.tam_bloque <= 0:
+        ap.error("--blocks requiere --block-size > 0")
+    if not args.num_bloques and not args.out_json:
+        ap.error("se requiere --out (o --blocks/--block-size para el modo por bloques)")
+
+    m = Metricas("generador_nombres", activo=bool(args.metrics or args.profile))
+    with m.perfilar(args.profile):
+        if args.num_bloques:
+            _main_bloques(args, preferidos, m)
+        else:
+            _main_archivo(args, preferidos, m)
+    m.guardar(args.metrics)
+
+def _main_bloques(args, preferidos: List[str], m: Metricas) -> None:
+    with m.etapa("generar_bloques") as e:
+        hechos, stats = generar_bloques(args.in_csv, args.out_dir, args.tam_bloque, args.num_bloques,
+                                        args.seed, preferidos, args.workers, args.formato or "json",
+                                        args.por_nombre, args.cache_ruta, args.cache_max)
+        e.filas = sum(n for _, n in hechos)
+        e.leyo(args.in_csv)
+        e.escribio(*(ruta for ruta, _ in hechos))
+    for ruta, n in hechos:
+        print(f"Escribí {n} entradas en {ruta}")
+    print(f"Bloques generados: {len(hechos)} de {args.num_bloques} (seed base={args.seed})")
+    if stats:
+        print(resumen(stats))
+
+def _main_archivo(args, preferidos: List[str], m: Metricas) -> None:
     random.seed(args.seed)
 
-    mapa = {"historica":"histórica","biblica":"bíblica","mitologica":"mitológica","poetica":"poética","fantastica":"fantástica"}
-    preferidos = [mapa.get(t.lower(), t) for t in args.types if mapa.get(t.lower(), t) in TIPOS]
-
-    out, count, skipped = [], 0, 0
-    with open(args.in_csv, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if args.skip_rows and skipped < args.skip_rows:
-                skipped += 1
-                continue
-            if args.max_rows and count >= args.max_rows:
-                break
-            item = procesar_fila(row, preferidos)
-            if item:
-                out.append(item)
-                count += 1
-
-    with open(args.out_json, "w", encoding="utf-8") as f:
-        json.dump(out, f, ensure_ascii=False, indent=2)
-    print(f"Escribí {len(out)} entradas en {args.out_json} (skip={args.skip_rows}, max={args.max_rows})")
+    # Las tres etapas se intercalan fila a fila; con métricas activas se cronometra cada una.
+    filas = m.iterar("leer_csv", leer_filas(args.in_csv, args.skip_rows, args.usar_indice))
+    ctx = CacheGeneracion(args.cache_ruta, args.cache_max) if args.cache_ruta else nullcontext()
+    with ctx as cache:
+        lote = m.iterar("generar", generar_lote(filas, preferidos, args.seed if args.por_nombre else None, cache),
+                        excluye=["leer_csv"])
+        with EscritorRegistros(args.out_json, args.formato) as w:
+            escritor = m.medir_escritor("serializar", w)
+            for item in islice(lote, args.max_rows or None):
+                escritor.escribir(item)
+    m.etapa_de("serializar").escribio(args.out_json)
+    if m.activo:
+        e = m.etapa_de("leer_csv")
+        e.bytes_leidos += bytes_leidos_csv(args.in_csv, args.skip_rows, e.filas, args.usar_indice)
+    print(f"Escribí {w.total} entradas en {args.out_json} (skip={args.skip_rows}, max={args.max_rows})")
+    if cache:
+        print(resumen(cache.estadisticas()))
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,7 @@
 # ------------------------
-
+# Equivalente multiplataforma en un solo proceso, que salta las etapas al día
+# (los bloques intermedios solo se escriben con --blocks-dir):
+#   python pipeline_nombres.py --blocks-dir public/data --export-dir public/data/nombres --search-dir public/data/busqueda
 # -------- CONFIG --------
 $csv = "nombres.csv"
 $bloqueTam = 100                 # tamaño del bloque
@@ -7,6 +9,8 @@ $numBloques = 30                 # 30 x 100 = 3000
 $seedBase = 200                  # semilla base para variar creatividad por bloque
 $outUnion = "public/data/nombres_completos.json"
 $outReporte = "reporte_dup.txt"
+$outShards = "public/data/nombres"
+$outBusqueda = "public/data/busqueda"
 # ------------------------
 
 Write-Host "Verificando CSV fuente..."
@@ -24,20 +28,13 @@ if ($estimadoFilas -lt ($bloqueTam * $numBloques)) {
   Write-Warning "ADVERTENCIA: El CSV parece tener menos de $totalNombres filas."
 }
 
-# Generar bloques
-for ($i = 0; $i -lt $numBloques; $i++) {
-  $skip = $i * $bloqueTam
-  $ini = "{0:D3}" -f ($skip + 1)
-  $fin = "{0:D3}" -f ($skip + $bloqueTam)
-  $out = "public/data/nombres_${ini}_${fin}.json"
-  $seed = $seedBase + $i
-
-  Write-Host ""
-  Write-Host "Generando bloque ($($i+1) de $numBloques)..."
-  py generador_nombres.py --in $csv --out $out --skip $skip --max $bloqueTam --seed $seed
-  if ($LASTEXITCODE -ne 0) {
-    Write-Warning "ERROR en el bloque $ini-$fin. Continuando..."
-  }
+# Generar bloques (un solo proceso de Python reparte los bloques entre los núcleos;
+# el bloque i usa la semilla $seedBase + i, igual que las ejecuciones por bloque)
+Write-Host ""
+Write-Host "Generando $numBloques bloques de $bloqueTam nombres..."
+py generador_nombres.py --in $csv --out-dir "public/data" --block-size $bloqueTam --blocks $numBloques --seed $seedBase
+if ($LASTEXITCODE -ne 0) {
+  Write-Warning "ERROR generando los bloques. Continuando..."
 }
 
 # Unir + deduplicar (por 'nombre', sin acentos y case-insensitive; conserva la PRIMERA aparición)
@@ -45,6 +42,16 @@ Write-Host ""
 Write-Host "Uniendo y deduplicando todos los bloques..."
 py unir_json_nombres_dedupe.py --out $outUnion --report $outReporte "public/data/nombres_*.json"
 
+# Exportar shards por inicial, precomprimidos (gzip; brotli si está instalado)
+Write-Host ""
+Write-Host "Exportando shards estaticos..."
+py exportar_estatico.py --out $outShards $outUnion
+
+# Índice de búsqueda por prefijo, insensible a acentos
+Write-Host ""
+Write-Host "Construyendo indice de busqueda..."
+py indice_busqueda.py construir --out $outBusqueda $outUnion
+
 # Estadísticas
 Write-Host ""
 Write-Host "Estadisticas del archivo final:"
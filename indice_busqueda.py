@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice de búsqueda de nombres, insensible a acentos y mayúsculas, partido en shards
+por prefijo para que una búsqueda cargue un solo archivo pequeño.
+
+- Normalización: normalizar() de unir_json_nombres_dedupe, la de make_key (sin acentos, minúsculas).
+- Shards: un JSON por prefijo normalizado de PREFIJO letras (p. ej. "so.json"),
+  con las claves ordenadas; más un manifiesto indice.json.
+- Búsqueda por prefijo: bisect sobre las claves ordenadas del shard.
+- Búsqueda aproximada: trigramas (coeficiente de Dice) dentro del shard del prefijo,
+  así que tolera errores a partir de la tercera letra (Isabela ~ Isabella).
+
+Uso:
+  py indice_busqueda.py construir --out public/data/busqueda public/data/nombres_completos.json
+  py indice_busqueda.py buscar --dir public/data/busqueda sof
+  py indice_busqueda.py buscar --dir public/data/busqueda --aprox isabela
+  py indice_busqueda.py bench                # índice vs. recorrido lineal con 3k, 30k y 300k nombres
+"""
+
+import argparse, bisect, json, os, random, tempfile, time
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import quote
+
+from registros_io import leer_registros, reemplazar_directorio
+from unir_json_nombres_dedupe import normalizar
+
+PREFIJO = 2
+MANIFIESTO = "indice.json"
+VERSION = 1
+
+def prefijo_de(clave: str, n: int = PREFIJO) -> str:
+    return clave[:n]
+
+def archivo_shard(prefijo: str) -> str:
+    # quote() deja nombres de archivo seguros para cualquier carácter del prefijo.
+    return quote(prefijo, safe="") + ".json"
+
+def trigramas(clave: str) -> set:
+    t = f"  {clave} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+def construir(registros: Iterable[Dict], out_dir: str, n: int = PREFIJO, entradas: Iterable[str] = ()) -> Dict:
+    """
+    Escribe los shards y el manifiesto en out_dir (se reemplaza entero).
+    Devuelve el manifiesto. Si una clave se repite se conserva el primer nombre.
+    Lanza ValueError si out_dir no es un índice anterior (o está vacía) o si
+    contiene alguno de los archivos de `entradas`.
+    """
+    if n <= 0:
+        raise ValueError(f"el prefijo debe ser positivo: {n}")
+    shards = defaultdict(dict)
+    for rec in registros:
+        nombre = rec.get("nombre", "")
+        if not isinstance(nombre, str):
+            nombre = str(nombre)
+        clave = normalizar(nombre)
+        if clave:
+            shards[prefijo_de(clave, n)].setdefault(clave, nombre)
+
+    manifiesto = {"version": VERSION, "prefijo": n, "total": 0, "shards": {}}
+    with reemplazar_directorio(out_dir, MANIFIESTO, entradas, ".busqueda-") as tmp:
+        for pre in sorted(shards):
+            claves = sorted(shards[pre].items())
+            archivo = archivo_shard(pre)
+            with open(os.path.join(tmp, archivo), "w", encoding="utf-8") as f:
+                json.dump(claves, f, ensure_ascii=False, separators=(",", ":"))
+            manifiesto["shards"][pre] = {"archivo": archivo, "total": len(claves)}
+            manifiesto["total"] += len(claves)
+        with open(os.path.join(tmp, MANIFIESTO), "w", encoding="utf-8") as f:
+            json.dump(manifiesto, f, ensure_ascii=False, indent=2, sort_keys=True)
+    return manifiesto
+
+class IndiceBusqueda:
+    """Búsquedas sobre un índice construido con construir(); los shards se cargan a demanda."""
+
+    def __init__(self, directorio: str, shards_en_memoria: int = 64):
+        self.directorio = directorio
+        with open(os.path.join(directorio, MANIFIESTO), "r", encoding="utf-8") as f:
+            self.manifiesto = json.load(f)
+        self.n = self.manifiesto["prefijo"]
+        self._shard = lru_cache(maxsize=shards_en_memoria)(self._cargar_shard)
+
+    def _cargar_shard(self, prefijo: str) -> Tuple[List[str], List[str]]:
+        info = self.manifiesto["shards"].get(prefijo)
+        if not info:
+            return [], []
+        with open(os.path.join(self.directorio, info["archivo"]), "r", encoding="utf-8") as f:
+            pares = json.load(f)
+        return [c for c, _ in pares], [nombre for _, nombre in pares]
+
+    def _prefijos(self, clave: str) -> List[str]:
+        if len(clave) >= self.n:
+            return [prefijo_de(clave, self.n)]
+        # Consulta más corta que el prefijo: todos los shards que empiezan por ella.
+        return sorted(p for p in self.manifiesto["shards"] if p.startswith(clave))
+
+    def buscar(self, consulta: str, limite: int = 10) -> List[str]:
+        """Nombres cuya forma normalizada empieza por la consulta, en orden alfabético."""
+        clave = normalizar(consulta)
+        if not clave:
+            return []
+        res = []
+        for pre in self._prefijos(clave):
+            claves, nombres = self._shard(pre)
+            i = bisect.bisect_left(claves, clave)
+            while i < len(claves) and claves[i].startswith(clave) and len(res) < limite:
+                res.append(nombres[i])
+                i += 1
+            if len(res) >= limite:
+                break
+        return res
+
+    def aproximado(self, consulta: str, limite: int = 10, umbral: float = 0.5) -> List[Tuple[str, float]]:
+        """Nombres del mismo prefijo parecidos a la consulta (Dice sobre trigramas), de mayor a menor."""
+        clave = normalizar(consulta)
+        if not clave:
+            return []
+        tq = trigramas(clave)
+        res = []
+        for pre in self._prefijos(clave):
+            claves, nombres = self._shard(pre)
+            for c, nombre in zip(claves, nombres):
+                tc = trigramas(c)
+                sim = 2 * len(tq & tc) / (len(tq) + len(tc))
+                if sim >= umbral:
+                    res.append((nombre, round(sim, 3)))
+        res.sort(key=lambda x: (-x[1], x[0]))
+        return res[:limite]
+
+def buscar_lineal(registros: List[Dict], consulta: str, limite: int = 10) -> List[str]:
+    """Recorrido lineal del JSON (lo que se hace sin índice); referencia para el benchmark."""
+    clave = normalizar(consulta)
+    res = [r["nombre"] for r in registros if normalizar(r.get("nombre", "")).startswith(clave)]
+    return sorted(res, key=normalizar)[:limite]
+
+SILABAS = ["ma", "ri", "so", "fi", "a", "le", "jan", "dro", "lu", "cí", "na", "te", "o", "is",
+           "bel", "va", "len", "ti", "ca", "mi", "la", "ga", "brie", "el", "ju", "lián", "án",
+           "ro", "sa", "ne", "zo", "ë", "ki", "to", "ha", "ru", "yu", "mé", "da", "vid"]
+
+def nombres_sinteticos(n: int, seed: int = 1) -> List[Dict]:
+    """n nombres únicos hechos de sílabas (con acentos), para medir a escala."""
+    rng = random.Random(seed)
+    vistos, out = set(), []
+    while len(out) < n:
+        nombre = "".join(rng.choice(SILABAS) for _ in range(rng.randint(2, 4))).capitalize()
+        if len(vistos) > n * 0.9:
+            nombre += str(len(out))
+        if nombre not in vistos:
+            vistos.add(nombre)
+            out.append({"nombre": nombre})
+    return out
+
+def bench(tamanos=(3_000, 30_000, 300_000), consultas: int = 200) -> List[Dict]:
+    resultados = []
+    for n in tamanos:
+        registros = nombres_sinteticos(n)
+        rng = random.Random(n)
+        qs = [normalizar(rng.choice(registros)["nombre"])[:rng.randint(2, 4)] for _ in range(consultas)]
+        with tempfile.TemporaryDirectory() as tmp:
+            t = time.perf_counter()
+            construir(registros, os.path.join(tmp, "idx"))
+            t_construir = time.perf_counter() - t
+
+            # En frío: un índice nuevo por consulta (carga del shard incluida).
+            t = time.perf_counter()
+            for q in qs:
+                IndiceBusqueda(os.path.join(tmp, "idx")).buscar(q)
+            t_frio = (time.perf_counter() - t) / len(qs)
+
+            idx = IndiceBusqueda(os.path.join(tmp, "idx"), shards_en_memoria=4096)
+            for q in qs:
+                idx.buscar(q)
+            t = time.perf_counter()
+            for q in qs:
+                idx.buscar(q)
+            t_caliente = (time.perf_counter() - t) / len(qs)
+
+        muestras = qs[:max(5, consultas // 20)]
+        t = time.perf_counter()
+        for q in muestras:
+            buscar_lineal(registros, q)
+        t_lineal = (time.perf_counter() - t) / len(muestras)
+        resultados.append({"nombres": n, "construir_s": round(t_construir, 4),
+                           "indice_frio_ms": round(t_frio * 1000, 4),
+                           "indice_caliente_ms": round(t_caliente * 1000, 4),
+                           "lineal_ms": round(t_lineal * 1000, 4)})
+    return resultados
+
+def main():
+    ap = argparse.ArgumentParser(description="Índice de búsqueda de nombres por prefijo (insensible a acentos).")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_c = sub.add_parser("construir", help="Construye el índice a partir de JSON/JSONL deduplicados.")
+    p_c.add_argument("--out", required=True,
+                     help="Carpeta de salida; se reemplaza entera, así que debe estar vacía o ser un índice anterior.")
+    p_c.add_argument("--prefijo", type=int, default=PREFIJO, help=f"Letras del prefijo de shard (default: {PREFIJO}).")
+    p_c.add_argument("archivos", nargs="+", help="Archivos JSON/JSONL de entrada.")
+    p_b = sub.add_parser("buscar", help="Busca nombres por prefijo (o aproximados con --aprox).")
+    p_b.add_argument("--dir", required=True, help="Carpeta del índice.")
+    p_b.add_argument("--aprox", action="store_true", help="Búsqueda aproximada por trigramas.")
+    p_b.add_argument("--limite", type=int, default=10)
+    p_b.add_argument("consulta")
+    p_x = sub.add_parser("bench", help="Compara índice y recorrido lineal con 3k, 30k y 300k nombres.")
+    p_x.add_argument("--tamanos", type=int, nargs="+", default=[3_000, 30_000, 300_000])
+    p_x.add_argument("--json", action="store_true", help="Salida JSON.")
+    args = ap.parse_args()
+
+    if args.cmd == "construir":
+        if args.prefijo <= 0:
+            p_c.error("--prefijo debe ser un entero positivo")
+        registros = (rec for ruta in args.archivos for rec in leer_registros(ruta))
+        try:
+            m = construir(registros, args.out, args.prefijo, args.archivos)
+        except ValueError as e:
+            p_c.error(str(e))
+        print(f"🔤 {m['total']} nombres en {len(m['shards'])} shards → {os.path.abspath(args.out)}")
+    elif args.cmd == "buscar":
+        idx = IndiceBusqueda(args.dir)
+        if args.aprox:
+            for nombre, sim in idx.aproximado(args.consulta, args.limite):
+                print(f"  • {nombre}  ({sim})")
+        else:
+            for nombre in idx.buscar(args.consulta, args.limite):
+                print(f"  • {nombre}")
+    else:
+        res = bench(tuple(args.tamanos))
+        if args.json:
+            print(json.dumps(res, indent=2))
+            return
+        print(f"{'nombres':>9} {'construir s':>12} {'índice frío ms':>15} {'índice caliente ms':>19} {'lineal ms':>10}")
+        for r in res:
+            print(f"{r['nombres']:>9} {r['construir_s']:>12} {r['indice_frio_ms']:>15} "
+                  f"{r['indice_caliente_ms']:>19} {r['lineal_ms']:>10}")
+
+if __name__ == "__main__":
+    main()
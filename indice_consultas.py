@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Artefacto indexado (SQLite) del dataset final, para consultar sin parsear el JSON completo.
+
+Lo escribe unir_json_nombres_dedupe.py con --index, junto al JSON. Índices:
+- nombre normalizado (la misma normalización de strip_accents/make_key: sin acentos, minúsculas)
+- origen normalizado, género y número numerológico
+
+Uso desde Python:
+    from indice_consultas import ConsultaNombres
+    with ConsultaNombres("public/data/nombres_completos.sqlite") as q:
+        q.buscar("Sofia")                       # registro completo o None
+        q.filtrar(origen="griego", genero="F")  # lista de registros
+        q.contar(numero=7)
+
+CLI:
+  py indice_consultas.py public/data/nombres_completos.sqlite --nombre sofia
+  py indice_consultas.py public/data/nombres_completos.sqlite --origen latin --genero M --limite 10
+"""
+
+import argparse, json, os, sqlite3, sys
+from typing import Dict, List, Optional
+
+from generador_nombres import calcular_numerologia
+from unir_json_nombres_dedupe import make_key, normalizar
+
+LOTE = 1000
+
+def _fila(rec: Dict) -> tuple:
+    nombre = rec.get("nombre", "")
+    if not isinstance(nombre, str):
+        nombre = str(nombre)
+    numero, _ = calcular_numerologia(nombre)
+    return (make_key(rec, "nombre", False, False), nombre,
+            (rec.get("genero") or "").upper(), normalizar(rec.get("origen", "")),
+            numero, json.dumps(rec, ensure_ascii=False))
+
+class EscritorIndice:
+    """
+    Construye el SQLite registro a registro (misma interfaz que EscritorRegistros).
+    Se escribe en un temporal y se reemplaza al cerrar; los índices se crean al final.
+    """
+
+    def __init__(self, ruta_db: str):
+        self.ruta = ruta_db
+        self.total = 0
+        self._tmp = f"{ruta_db}.{os.getpid()}.tmp"
+        self._pendientes = []
+        self._con = None
+
+    def __enter__(self):
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+        self._con = sqlite3.connect(self._tmp)
+        self._con.execute("PRAGMA journal_mode=OFF")
+        self._con.execute("PRAGMA synchronous=OFF")
+        self._con.execute("CREATE TABLE nombres (id INTEGER PRIMARY KEY, clave TEXT NOT NULL, "
+                          "nombre TEXT NOT NULL, genero TEXT NOT NULL, origen TEXT NOT NULL, "
+                          "numero INTEGER NOT NULL, registro TEXT NOT NULL)")
+        return self
+
+    def escribir(self, rec: Dict) -> None:
+        self._pendientes.append(_fila(rec))
+        self.total += 1
+        if len(self._pendientes) >= LOTE:
+            self._volcar()
+
+    def _volcar(self) -> None:
+        self._con.executemany("INSERT INTO nombres (clave, nombre, genero, origen, numero, registro) "
+                              "VALUES (?, ?, ?, ?, ?, ?)", self._pendientes)
+        self._pendientes.clear()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._con.close()
+            os.remove(self._tmp)
+            return False
+        self._volcar()
+        self._con.execute("CREATE INDEX nombres_clave ON nombres(clave)")
+        self._con.execute("CREATE INDEX nombres_origen ON nombres(origen, genero)")
+        self._con.execute("CREATE INDEX nombres_genero ON nombres(genero)")
+        self._con.execute("CREATE INDEX nombres_numero ON nombres(numero)")
+        self._con.commit()
+        self._con.execute("VACUUM")
+        self._con.close()
+        os.replace(self._tmp, self.ruta)
+        return False
+
+class ConsultaNombres:
+    """API de consulta sobre el SQLite generado por EscritorIndice."""
+
+    def __init__(self, ruta_db: str):
+        self._con = sqlite3.connect(f"file:{ruta_db}?mode=ro", uri=True, check_same_thread=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cerrar()
+        return False
+
+    def cerrar(self) -> None:
+        self._con.close()
+
+    def buscar(self, nombre: str) -> Optional[Dict]:
+        """Registro del nombre (sin importar acentos ni mayúsculas) o None."""
+        fila = self._con.execute("SELECT registro FROM nombres WHERE clave = ? ORDER BY id LIMIT 1",
+                                 (normalizar(nombre),)).fetchone()
+        return json.loads(fila[0]) if fila else None
+
+    def _where(self, origen, genero, numero) -> tuple:
+        conds, params = [], []
+        if origen:
+            conds.append("origen = ?"); params.append(normalizar(origen))
+        if genero:
+            conds.append("genero = ?"); params.append(genero.upper())
+        if numero is not None:
+            conds.append("numero = ?"); params.append(int(numero))
+        return (" WHERE " + " AND ".join(conds)) if conds else "", params
+
+    def filtrar(self, origen: str = None, genero: str = None, numero: int = None,
+                limite: int = None) -> List[Dict]:
+        """Registros que cumplen todos los filtros dados, en el orden del dataset."""
+        where, params = self._where(origen, genero, numero)
+        sql = f"SELECT registro FROM nombres{where} ORDER BY id"
+        if limite:
+            sql += " LIMIT ?"; params.append(int(limite))
+        return [json.loads(r) for (r,) in self._con.execute(sql, params)]
+
+    def contar(self, origen: str = None, genero: str = None, numero: int = None) -> int:
+        where, params = self._where(origen, genero, numero)
+        return self._con.execute(f"SELECT COUNT(*) FROM nombres{where}", params).fetchone()[0]
+
+def main():
+    ap = argparse.ArgumentParser(description="Consulta el índice SQLite de nombres.")
+    ap.add_argument("db", help="Archivo SQLite generado con unir_json_nombres_dedupe.py --index.")
+    ap.add_argument("--nombre", default="", help="Busca un nombre (sin importar acentos ni mayúsculas).")
+    ap.add_argument("--origen", default="", help="Filtra por origen.")
+    ap.add_argument("--genero", default="", help="Filtra por género (M, F, U...).")
+    ap.add_argument("--numero", type=int, default=None, help="Filtra por número numerológico.")
+    ap.add_argument("--limite", type=int, default=20, help="Máximo de resultados al filtrar (default: 20).")
+    args = ap.parse_args()
+
+    if not os.path.isfile(args.db):
+        print(f"⚠️ No existe el índice: {args.db}", file=sys.stderr)
+        sys.exit(1)
+    with ConsultaNombres(args.db) as q:
+        if args.nombre:
+            rec = q.buscar(args.nombre)
+            if rec is None:
+                print(f"(sin resultados para {args.nombre})")
+                sys.exit(1)
+            print(json.dumps(rec, ensure_ascii=False, indent=2))
+            return
+        total = q.contar(args.origen, args.genero, args.numero)
+        print(f"🔎 {total} coincidencia(s)")
+        for rec in q.filtrar(args.origen, args.genero, args.numero, args.limite):
+            print(f"  • {rec.get('nombre')} ({rec.get('genero')}, {rec.get('origen')})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índice de desplazamientos (offsets) de filas para un CSV, guardado junto al CSV
+como <archivo>.idx. Permite que --skip salte directo al primer byte de la fila
+pedida en vez de recorrer el CSV fila por fila.
+
+- Se construye una sola vez y se invalida si cambian el tamaño o el mtime del CSV.
+- Respeta campos entre comillas con saltos de línea (columna Significado): los
+  registros se cortan con csv.reader, igual que al leer el CSV sin índice.
+
+Formato binario del .idx (little-endian):
+  cabecera: magia (8 bytes), tamaño CSV (Q), mtime_ns (q), número de filas (Q)
+  cuerpo:   num_filas + 1 offsets (Q); el último es el fin de archivo.
+Leer el offset de la fila N es un seek a posición fija: O(1).
+
+Uso:
+  py indice_csv.py nombres.csv          # construye/actualiza nombres.csv.idx
+"""
+
+import csv, io, os, struct, sys
+from typing import Dict, Iterator, List, Optional
+
+MAGIA = b"ONOIDX2\0"  # v2: offsets calculados con csv.reader
+CABECERA = struct.Struct("<8sQqQ")
+OFFSET = struct.Struct("<Q")
+
+def ruta_indice(csv_path: str) -> str:
+    return csv_path + ".idx"
+
+def _firma(csv_path: str) -> tuple:
+    st = os.stat(csv_path)
+    return st.st_size, st.st_mtime_ns
+
+def calcular_offsets(csv_path: str) -> List[int]:
+    """
+    Recorre el CSV en binario y devuelve el offset de inicio de cada fila de datos
+    (sin la cabecera) más el offset de fin de archivo.
+    Los límites de registro los decide el propio csv.reader (el mismo parser que usa
+    DictReader), así que comillas escapadas, sueltas a mitad de campo (O"Brien) o
+    saltos de línea dentro de un campo cortan exactamente igual que al leer sin índice.
+    """
+    offsets = []
+    pos = 0
+
+    def lineas(f):
+        nonlocal pos
+        for linea in f:
+            pos += len(linea)
+            yield linea.decode("utf-8")
+
+    with open(csv_path, "rb") as f:
+        lector = csv.reader(lineas(f))
+        # csv.reader pide líneas de a una y no lee por adelantado: al devolver un
+        # registro, pos está justo al final de ese registro.
+        if next(lector, None) is not None:  # cabecera
+            inicio = pos
+            for fila in lector:
+                if fila:  # DictReader también salta las líneas vacías
+                    offsets.append(inicio)
+                inicio = pos
+    offsets.append(pos)
+    return offsets
+
+def construir_indice(csv_path: str) -> int:
+    """Escribe <csv>.idx y devuelve el número de filas indexadas."""
+    size, mtime_ns = _firma(csv_path)
+    offsets = calcular_offsets(csv_path)
+    tmp = f"{ruta_indice(csv_path)}.{os.getpid()}.tmp"  # varios procesos pueden construirlo a la vez
+    with open(tmp, "wb") as f:
+        f.write(CABECERA.pack(MAGIA, size, mtime_ns, len(offsets) - 1))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+    os.replace(tmp, ruta_indice(csv_path))
+    return len(offsets) - 1
+
+def indice_vigente(csv_path: str) -> bool:
+    """True si el .idx existe y corresponde al tamaño/mtime actuales del CSV."""
+    try:
+        with open(ruta_indice(csv_path), "rb") as f:
+            magia, size, mtime_ns, _ = CABECERA.unpack(f.read(CABECERA.size))
+    except (OSError, struct.error):
+        return False
+    return magia == MAGIA and (size, mtime_ns) == _firma(csv_path)
+
+def asegurar_indice(csv_path: str) -> None:
+    if not indice_vigente(csv_path):
+        construir_indice(csv_path)
+
+def offset_fila(csv_path: str, n: int) -> Optional[int]:
+    """
+    Offset en bytes de la fila de datos n (0 = primera tras la cabecera).
+    Si n supera el número de filas devuelve el fin de archivo.
+    """
+    asegurar_indice(csv_path)
+    with open(ruta_indice(csv_path), "rb") as f:
+        _, _, _, num_filas = CABECERA.unpack(f.read(CABECERA.size))
+        f.seek(CABECERA.size + OFFSET.size * min(n, num_filas))
+        return OFFSET.unpack(f.read(OFFSET.size))[0]
+
+def leer_desde(csv_path: str, skip: int) -> Iterator[Dict[str, str]]:
+    """
+    Equivale a csv.DictReader saltando las primeras `skip` filas de datos,
+    pero sin parsearlas: lee la cabecera y hace seek al offset indexado.
+    """
+    # Misma decodificación que open(csv_path, "r", encoding="utf-8") en el generador,
+    # para que los campos multilínea salgan idénticos con y sin índice.
+    with open(csv_path, "rb") as raw:
+        f = io.TextIOWrapper(raw, encoding="utf-8")
+        campos = next(csv.reader(f), None)
+        if campos is None:
+            return
+        f.detach()
+        raw.seek(offset_fila(csv_path, skip))
+        f = io.TextIOWrapper(raw, encoding="utf-8")
+        yield from csv.DictReader(f, fieldnames=campos)
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: py indice_csv.py archivo.csv", file=sys.stderr)
+        sys.exit(1)
+    for ruta in sys.argv[1:]:
+        n = construir_indice(ruta)
+        print(f"🗂️ Índice de {n} filas escrito en {ruta_indice(ruta)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instrumentación común de los scripts del pipeline (generador, uniones y estadísticas).
+
+- Etapas con tiempo de pared, filas, filas/s, bytes leídos/escritos y pico de RSS.
+- Se vuelcan a un JSON de métricas con --metrics ruta.json.
+- --profile base escribe base.prof (cProfile, abrible con pstats/snakeviz) y base.txt
+  con las funciones más costosas y las líneas que más memoria reservaron (tracemalloc).
+
+Sin --metrics ni --profile el costo es prácticamente nulo: iterar() y medir_escritor()
+devuelven el objeto original sin envolverlo, y las etapas solo toman dos marcas de tiempo.
+
+Uso:
+    m = Metricas("generador_nombres", activo=bool(args.metrics))
+    with m.perfilar(args.profile):
+        with m.etapa("leer_csv") as e:
+            ...
+            e.filas = n
+            e.leyo(ruta)
+    m.guardar(args.metrics)
+"""
+
+import cProfile, datetime, io, json, os, pstats, sys, time, tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage, el pico de RSS queda en null
+    resource = None
+
+def pico_rss_mb() -> Optional[float]:
+    """Pico de memoria residente del proceso y de sus hijos ya terminados (MB)."""
+    if resource is None:
+        return None
+    propio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    hijos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # Linux informa KB; macOS, bytes.
+    divisor = 2**20 if sys.platform == "darwin" else 2**10
+    return round(max(propio, hijos) / divisor, 2)
+
+class Etapa:
+    def __init__(self, nombre: str, excluye: List[str] = ()):
+        self.nombre = nombre
+        self.excluye = list(excluye)
+        self.segundos = 0.0
+        self.filas = 0
+        self.bytes_leidos = 0
+        self.bytes_escritos = 0
+        self.pico_rss_mb = None
+
+    def leyo(self, *rutas: str) -> None:
+        for r in rutas:
+            if r and os.path.isfile(r):
+                self.bytes_leidos += os.path.getsize(r)
+
+    def escribio(self, *rutas: str) -> None:
+        for r in rutas:
+            if r and os.path.isfile(r):
+                self.bytes_escritos += os.path.getsize(r)
+
+class _EscritorMedido:
+    """Envuelve un escritor (EscritorRegistros, EscritorMultiple...) midiendo escribir() y escribir_texto()."""
+
+    def __init__(self, escritor, etapa: Etapa):
+        self._escritor = escritor
+        self._etapa = etapa
+
+    def escribir(self, rec) -> None:
+        t = time.perf_counter()
+        self._escritor.escribir(rec)
+        self._etapa.segundos += time.perf_counter() - t
+        self._etapa.filas += 1
+
+    def escribir_texto(self, texto: str) -> None:
+        t = time.perf_counter()
+        self._escritor.escribir_texto(texto)
+        self._etapa.segundos += time.perf_counter() - t
+        self._etapa.filas += 1
+
+    def __getattr__(self, nombre):
+        return getattr(self._escritor, nombre)
+
+class Metricas:
+    def __init__(self, script: str, activo: bool = False):
+        self.script = script
+        self.activo = activo
+        self.inicio = datetime.datetime.now().isoformat(timespec="seconds")
+        self._t0 = time.perf_counter()
+        self._etapas: Dict[str, Etapa] = {}
+
+    def etapa_de(self, nombre: str, excluye: List[str] = ()) -> Etapa:
+        """Etapa `nombre` (se crea si no existe), p. ej. para anotar bytes leídos."""
+        if nombre not in self._etapas:
+            self._etapas[nombre] = Etapa(nombre, excluye)
+        return self._etapas[nombre]
+
+    @contextmanager
+    def etapa(self, nombre: str, excluye: List[str] = ()):
+        """
+        Mide un bloque de código; el tiempo se acumula si la etapa se repite.
+        `excluye`: etapas medidas dentro del bloque cuyo tiempo se descuenta al informar.
+        """
+        e = self.etapa_de(nombre, excluye)
+        t = time.perf_counter()
+        try:
+            yield e
+        finally:
+            e.segundos += time.perf_counter() - t
+            if self.activo:
+                e.pico_rss_mb = pico_rss_mb()
+
+    def iterar(self, nombre: str, iterable: Iterable, excluye: List[str] = (),
+               filas: Optional[Callable] = None) -> Iterable:
+        """
+        Mide el tiempo pasado dentro de un iterador (p. ej. un generador perezoso) y
+        cuenta sus elementos. `excluye`: etapas anidadas cuyo tiempo se descuenta al
+        informar (generar_lote incluye la lectura del CSV que consume). `filas`: filas
+        que aporta cada elemento cuando son lotes (default: 1 por elemento).
+        Desactivado devuelve el iterable tal cual.
+        """
+        if not self.activo:
+            return iterable
+        return self._iterar(self.etapa_de(nombre, excluye), iter(iterable), filas)
+
+    def _iterar(self, e: Etapa, it: Iterator, filas: Optional[Callable] = None) -> Iterator:
+        reloj = time.perf_counter
+        try:
+            while True:
+                t = reloj()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    e.segundos += reloj() - t
+                    return
+                e.segundos += reloj() - t
+                e.filas += filas(item) if filas else 1
+                yield item
+        finally:
+            # Al agotarse o al cerrarse (p. ej. islice que corta antes del final).
+            e.pico_rss_mb = pico_rss_mb()
+
+    def medir_escritor(self, nombre: str, escritor):
+        """Escritor cuyo escribir() se cronometra en la etapa `nombre` (desactivado: el mismo)."""
+        if not self.activo:
+            return escritor
+        return _EscritorMedido(escritor, self.etapa_de(nombre))
+
+    def a_dict(self) -> Dict:
+        etapas = []
+        for e in self._etapas.values():
+            if e.pico_rss_mb is None and self.activo:
+                # Etapas sin fin explícito (medir_escritor): el pico hasta el informe.
+                e.pico_rss_mb = pico_rss_mb()
+            seg = e.segundos - sum(self._etapas[x].segundos for x in e.excluye if x in self._etapas)
+            etapas.append({"etapa": e.nombre, "segundos": round(seg, 6), "filas": e.filas,
+                           "filas_por_seg": round(e.filas / seg, 1) if seg > 0 and e.filas else None,
+                           "bytes_leidos": e.bytes_leidos, "bytes_escritos": e.bytes_escritos,
+                           "pico_rss_mb": e.pico_rss_mb})
+        return {"script": self.script, "inicio": self.inicio, "argv": sys.argv[1:],
+                "total_s": round(time.perf_counter() - self._t0, 6),
+                "pico_rss_mb": pico_rss_mb(), "etapas": etapas}
+
+    def guardar(self, ruta: str) -> None:
+        if not ruta:
+            return
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.a_dict(), f, ensure_ascii=False, indent=2)
+        # A stderr: stdout queda limpio para salidas como estadisticas_nombres.py --json.
+        print(f"📈 Métricas: {os.path.abspath(ruta)}", file=sys.stderr)
+
+    @contextmanager
+    def perfilar(self, base: str, top: int = 30):
+        """Con `base`, ejecuta el bloque bajo cProfile y tracemalloc y escribe base.prof / base.txt."""
+        if not base:
+            yield
+            return
+        perfil = cProfile.Profile()
+        tracemalloc.start()
+        perfil.enable()
+        try:
+            yield
+        finally:
+            perfil.disable()
+            foto = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            perfil.dump_stats(base + ".prof")
+            texto = io.StringIO()
+            pstats.Stats(perfil, stream=texto).sort_stats("cumulative").print_stats(top)
+            texto.write("\nMemoria reservada por línea (tracemalloc):\n")
+            for st in foto.statistics("lineno")[:15]:
+                texto.write(f"  {st}\n")
+            with open(base + ".txt", "w", encoding="utf-8") as f:
+                f.write(texto.getvalue())
+            print(f"🔬 Perfil: {os.path.abspath(base + '.prof')} y {os.path.abspath(base + '.txt')}", file=sys.stderr)
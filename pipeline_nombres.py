@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline completo en Python (reemplazo multiplataforma de generar_1_a_3000.ps1):
+
+    CSV -> generar bloques -> unir + deduplicar -> [exportar shards] -> [índice de búsqueda] -> estadísticas
+
+Los registros pasan de una etapa a la siguiente en memoria, en una tabla compacta
+(tabla_nombres.py): los bloques solo se escriben a disco si se pide --blocks-dir.
+Como make, cada etapa guarda en el archivo de estado la huella de sus entradas
+(contenido del CSV, semillas, parámetros y código fuente del generador / de la etapa)
+y se salta si no cambió y su salida sigue existiendo. --force rehace todo.
+Los bloques escritos se releen solo si son exactamente los que esta configuración
+escribió (mismas rutas, misma carpeta y mismo contenido, según el estado).
+
+Uso:
+  py pipeline_nombres.py                                   # mismos parámetros que el .ps1
+  py pipeline_nombres.py --in nombres.csv --block-size 100 --blocks 30 --seed 200 \\
+      --out public/data/nombres_completos.json --report reporte_dup.txt [--blocks-dir public/data] \\
+      [--export-dir public/data/nombres] [--search-dir public/data/busqueda]
+"""
+
+import argparse, hashlib, json, os, random, sys, tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import base_conocimiento
+import estadisticas_nombres
+import exportar_estatico
+import generador_nombres
+import indice_busqueda
+import unir_json_nombres_dedupe
+from metricas import Metricas
+from registros_io import (BACKENDS, EscritorRegistros, FORMATOS, comprobar_reemplazo, formato_de, leer_registros,
+                          usar_backend)
+from tabla_nombres import TablaNombres, cargar
+from unir_json_nombres_dedupe import deduplicar_tabla, escribir_reporte, make_key
+
+ESTADO = "pipeline_nombres.estado.json"
+
+def huella(*partes, archivos: List[str] = ()) -> str:
+    """Hash de los parámetros dados y del contenido de los archivos."""
+    h = hashlib.sha256(json.dumps(partes, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    for ruta in archivos:
+        with open(ruta, "rb") as f:
+            for trozo in iter(lambda: f.read(1 << 20), b""):
+                h.update(trozo)
+    return h.hexdigest()
+
+def _fuente(modulo) -> str:
+    return os.path.abspath(modulo.__file__)
+
+def leer_estado(ruta: str) -> Dict:
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def guardar_estado(ruta: str, estado: Dict) -> None:
+    tmp = ruta + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp, ruta)
+
+def _generar_bloque(filas: List[Dict[str, str]], preferidos: List[str], seed: int, por_nombre: bool,
+                    ruta: str = "", formato: str = "json") -> List[Dict]:
+    """Genera un bloque en un proceso del pool y devuelve sus registros (y lo escribe si hay ruta)."""
+    random.seed(seed)
+    registros = list(generador_nombres.generar_lote(filas, preferidos, seed if por_nombre else None))
+    if ruta:
+        with EscritorRegistros(ruta, formato) as w:
+            for rec in registros:
+                w.escribir(rec)
+    return registros
+
+def planificar(in_csv: str, tam: int, num_bloques: int, blocks_dir: str = "",
+               formato: str = "json") -> Tuple[List[tuple], List[str]]:
+    """
+    Bloques de repartir_bloques y la ruta de cada uno en blocks_dir (nombre_bloque);
+    sin blocks_dir las rutas quedan vacías.
+    """
+    bloques = generador_nombres.repartir_bloques(list(generador_nombres.leer_filas(in_csv)), tam, num_bloques)
+    rutas = [os.path.join(blocks_dir, generador_nombres.nombre_bloque(skip, tam, formato)) if blocks_dir else ""
+             for _, skip, _ in bloques]
+    return bloques, rutas
+
+def huellas_bloques(rutas: List[str]) -> Dict[str, str]:
+    """{ruta absoluta: hash del contenido} de los bloques escritos (vacío sin bloques)."""
+    return {os.path.abspath(r): huella(archivos=[r]) for r in rutas if r}
+
+def bloques_vigentes(previo, h_gen: str, blocks_dir: str, rutas: List[str]) -> bool:
+    """
+    True si el estado registra que esta misma configuración escribió exactamente `rutas`
+    en blocks_dir y ninguna cambió desde entonces.
+    """
+    if not blocks_dir or not isinstance(previo, dict) or previo.get("huella") != h_gen:
+        return False
+    if previo.get("blocks_dir") != os.path.abspath(blocks_dir):
+        return False
+    esperadas = [os.path.abspath(r) for r in rutas]
+    registradas = previo.get("bloques") or {}
+    if not esperadas or sorted(esperadas) != sorted(registradas):
+        return False
+    return all(os.path.isfile(r) and huella(archivos=[r]) == registradas[r] for r in esperadas)
+
+def generar(in_csv: str, tam: int, num_bloques: int, seed_base: int, preferidos: List[str],
+            workers: int = 0, por_nombre: bool = False, blocks_dir: str = "",
+            formato: str = "json") -> TablaNombres:
+    """
+    Mismo reparto y mismas semillas que generador_nombres.generar_bloques (bloque i: seed_base + i),
+    pero devuelve los registros en una tabla compacta, en orden de bloque.
+    """
+    bloques, rutas = planificar(in_csv, tam, num_bloques, blocks_dir, formato)
+    if blocks_dir:
+        os.makedirs(blocks_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers or None) as pool:
+        futuros = [pool.submit(_generar_bloque, filas_bloque, preferidos,
+                               seed_base if por_nombre else seed_base + i, por_nombre, ruta, formato)
+                   for (i, _, filas_bloque), ruta in zip(bloques, rutas)]
+        tabla = TablaNombres()
+        futuros.reverse()
+        while futuros:
+            # Al soltar el futuro se liberan los dicts del bloque, que ya están en la tabla.
+            for rec in futuros.pop().result():
+                tabla.agregar(rec)
+        return tabla
+
+def main():
+    ap = argparse.ArgumentParser(description="Pipeline de nombres: generar -> unir/deduplicar -> estadísticas.")
+    ap.add_argument("--infile", "--in", dest="in_csv", default="nombres.csv", help="CSV fuente (default: nombres.csv).")
+    ap.add_argument("--block-size", dest="tam_bloque", type=int, default=100, help="Nombres por bloque (default: 100).")
+    ap.add_argument("--blocks", dest="num_bloques", type=int, default=30, help="Cantidad de bloques (default: 30).")
+    ap.add_argument("--seed", type=int, default=200, help="Semilla base; el bloque i usa seed + i (default: 200).")
+    ap.add_argument("--types", nargs="*", default=[], help="Restringe tipos: historica biblica mitologica poetica fantastica")
+    ap.add_argument("--per-name-seed", dest="por_nombre", action="store_true",
+                    help="Semilla por nombre en vez de por bloque (ver generador_nombres.py).")
+    ap.add_argument("--workers", type=int, default=0, help="Procesos para generar los bloques (0 = núcleos disponibles).")
+    ap.add_argument("--blocks-dir", dest="blocks_dir", default="",
+                    help="Escribe también los bloques intermedios en esta carpeta (por defecto no se escriben).")
+    ap.add_argument("--out", default="public/data/nombres_completos.json", help="JSON/JSONL unido y deduplicado.")
+    ap.add_argument("--format", dest="formato", choices=FORMATOS, default=None,
+                    help="Formato de --out (default: según extensión); los bloques usan el mismo.")
+    ap.add_argument("--compact", dest="compacto", action="store_true",
+                    help="Lista JSON de --out sin indentar (un registro compacto por línea).")
+    ap.add_argument("--json-backend", dest="backend", choices=BACKENDS, default="json",
+                    help="json (biblioteca estándar), orjson o auto (orjson si está instalado).")
+    ap.add_argument("--report", default="reporte_dup.txt", help="Reporte de duplicados (default: reporte_dup.txt).")
+    ap.add_argument("--key", default="nombre", help="Campo clave para deduplicar (default: nombre).")
+    ap.add_argument("--keep", choices=["first", "last"], default="first")
+    ap.add_argument("--case-sensitive", action="store_true")
+    ap.add_argument("--keep-accents", action="store_true")
+    ap.add_argument("--export-dir", dest="export_dir", default="",
+                    help="Exporta también shards por inicial precomprimidos (ver exportar_estatico.py). "
+                         "La carpeta se reemplaza entera: debe estar vacía o ser una exportación anterior.")
+    ap.add_argument("--search-dir", dest="search_dir", default="",
+                    help="Construye también el índice de búsqueda por prefijo (ver indice_busqueda.py). "
+                         "La carpeta se reemplaza entera: debe estar vacía o ser un índice anterior.")
+    ap.add_argument("--stats", default="", help="JSON de estadísticas (default: <out>.estadisticas.json).")
+    ap.add_argument("--bucket", type=int, default=estadisticas_nombres.ANCHO_HISTOGRAMA,
+                    help="Ancho del histograma de longitud del significado, en palabras.")
+    ap.add_argument("--state", dest="estado", default=ESTADO, help=f"Archivo de estado de las etapas (default: {ESTADO}).")
+    ap.add_argument("--force", action="store_true", help="Rehace todas las etapas aunque estén al día.")
+    ap.add_argument("--metrics", default="", help="Escribe métricas por etapa (tiempo, filas/s, bytes, RSS) en este JSON.")
+    ap.add_argument("--profile", default="", help="Perfila la corrida: escribe <base>.prof (cProfile) y <base>.txt.")
+    args = ap.parse_args()
+    if args.bucket <= 0:
+        ap.error("--bucket debe ser un entero positivo")
+
+    if not os.path.isfile(args.in_csv):
+        print(f"❌ No se encontró el CSV fuente: {args.in_csv}", file=sys.stderr)
+        sys.exit(1)
+    try:
+        usar_backend(args.backend)
+    except ValueError as e:
+        ap.error(str(e))
+    preferidos = generador_nombres.tipos_preferidos(args.types)
+    formato = formato_de(args.out, args.formato)
+    stats_json = args.stats or os.path.splitext(args.out)[0] + ".estadisticas.json"
+    estado = {} if args.force else leer_estado(args.estado)
+    # Las carpetas de --export-dir/--search-dir se reemplazan enteras: se comprueban antes de empezar.
+    entradas = [args.in_csv, args.out, args.report, stats_json, args.estado, args.blocks_dir]
+    for carpeta, marca in ((args.export_dir, exportar_estatico.MANIFIESTO), (args.search_dir, indice_busqueda.MANIFIESTO)):
+        if carpeta:
+            try:
+                comprobar_reemplazo(carpeta, marca, entradas)
+            except ValueError as e:
+                ap.error(str(e))
+
+    # Huellas encadenadas: si cambia una etapa, cambian las de todas las siguientes.
+    h_gen = huella("generar", args.tam_bloque, args.num_bloques, args.seed, preferidos, args.por_nombre,
+                   archivos=[args.in_csv, _fuente(generador_nombres), base_conocimiento.RUTA_JSON])
+    h_unir = huella("unir", h_gen, args.key, args.keep, args.case_sensitive, args.keep_accents, formato, args.compacto,
+                    archivos=[_fuente(unir_json_nombres_dedupe)])
+    # La salida de la exportación depende de si brotli está instalado.
+    h_export = huella("exportar", h_unir, exportar_estatico.brotli is not None,
+                      archivos=[_fuente(exportar_estatico)])
+    h_busqueda = huella("busqueda", h_unir, indice_busqueda.PREFIJO, archivos=[_fuente(indice_busqueda)])
+    h_stats = huella("estadisticas", h_unir, args.bucket, archivos=[_fuente(estadisticas_nombres)])
+
+    m = Metricas("pipeline_nombres", activo=bool(args.metrics or args.profile))
+    clave = lambda rec: make_key(rec, args.key, args.case_sensitive, args.keep_accents)
+    tabla = conservados = None
+    with m.perfilar(args.profile):
+        # Los bloques pedidos con --blocks-dir se comprueban aparte: aunque la unión esté al día,
+        # si faltan o cambiaron (o la carpeta es otra) hay que generarlos.
+        rutas = []
+        if args.blocks_dir:
+            _, rutas = planificar(args.in_csv, args.tam_bloque, args.num_bloques, args.blocks_dir, formato)
+        bloques_al_dia = bloques_vigentes(estado.get("generar"), h_gen, args.blocks_dir, rutas)
+        if (estado.get("unir") == h_unir and os.path.isfile(args.out) and os.path.isfile(args.report)
+                and (bloques_al_dia or not args.blocks_dir)):
+            print(f"⏭️ Unión al día: {args.out}")
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+            dups = tempfile.TemporaryFile("w+", encoding="utf-8")
+            if bloques_al_dia:
+                # Los bloques del disco son los que escribió esta configuración: se releen.
+                bloques_previos = [os.path.abspath(r) for r in rutas]
+                print(f"⏭️ Bloques al día en {args.blocks_dir}; se releen.")
+                with m.etapa("leer_bloques") as e:
+                    tabla = cargar(bloques_previos)
+                    e.filas = len(tabla)
+                    e.leyo(*bloques_previos)
+            else:
+                print(f"⚙️ Generando {args.num_bloques} bloques de {args.tam_bloque} nombres (seed base={args.seed})...")
+                with m.etapa("generar") as e:
+                    tabla = generar(args.in_csv, args.tam_bloque, args.num_bloques, args.seed, preferidos,
+                                    args.workers, args.por_nombre, args.blocks_dir, formato)
+                    e.filas = len(tabla)
+                    e.leyo(args.in_csv)
+                estado["generar"] = {"huella": h_gen,
+                                     "blocks_dir": os.path.abspath(args.blocks_dir) if args.blocks_dir else "",
+                                     "bloques": huellas_bloques(rutas)}
+            idx_by_key = {}
+            with m.etapa("deduplicar", excluye=["serializar"]) as e, EscritorRegistros(args.out, formato, args.compacto) as w:
+                total, _ = deduplicar_tabla(tabla, m.medir_escritor("serializar", w), clave, args.keep,
+                                            dups, idx_by_key)
+                e.filas = total
+            m.etapa_de("serializar").escribio(args.out)
+            # Las filas conservadas pasan a estadísticas como índices de la tabla.
+            conservados = sorted(idx_by_key.values())
+            del idx_by_key
+            removidos = total - len(conservados)
+            escribir_reporte(args.report, removidos, dups, args.key, args.keep, args.case_sensitive, args.keep_accents)
+            dups.close()
+            estado["unir"] = h_unir
+            guardar_estado(args.estado, estado)
+            print(f"🧹 {total} entradas, {removidos} duplicados removidos -> {args.out}")
+            print(f"📝 Reporte: {args.report}")
+
+        if not args.export_dir:
+            pass
+        elif estado.get("exportar") == h_export and os.path.isfile(
+                os.path.join(args.export_dir, exportar_estatico.MANIFIESTO)):
+            print(f"⏭️ Exportación al día: {args.export_dir}")
+        else:
+            with m.etapa("exportar") as e:
+                registros = leer_registros(args.out) if tabla is None else tabla.registros(conservados)
+                manifiesto = exportar_estatico.exportar(registros, args.export_dir, entradas)
+                e.filas = manifiesto["total"]
+            estado["exportar"] = h_export
+            guardar_estado(args.estado, estado)
+            print(f"📦 {manifiesto['total']} nombres en {len(manifiesto['shards'])} shards -> {args.export_dir}")
+
+        if not args.search_dir:
+            pass
+        elif estado.get("busqueda") == h_busqueda and os.path.isfile(
+                os.path.join(args.search_dir, indice_busqueda.MANIFIESTO)):
+            print(f"⏭️ Índice de búsqueda al día: {args.search_dir}")
+        else:
+            with m.etapa("busqueda") as e:
+                registros = leer_registros(args.out) if tabla is None else tabla.registros(conservados)
+                manifiesto = indice_busqueda.construir(registros, args.search_dir, entradas=entradas)
+                e.filas = manifiesto["total"]
+            estado["busqueda"] = h_busqueda
+            guardar_estado(args.estado, estado)
+            print(f"🔤 {manifiesto['total']} nombres en {len(manifiesto['shards'])} shards de búsqueda -> {args.search_dir}")
+
+        if estado.get("estadisticas") == h_stats and os.path.isfile(stats_json):
+            print(f"⏭️ Estadísticas al día: {stats_json}")
+        else:
+            with m.etapa("estadisticas") as e:
+                if tabla is None:
+                    st = estadisticas_nombres.agregar_archivo(args.out, args.bucket)
+                    e.leyo(args.out)
+                else:
+                    st = estadisticas_nombres.agregar_tabla(tabla, args.bucket, conservados)
+                e.filas = st["total"]
+                with open(stats_json, "w", encoding="utf-8") as f:
+                    json.dump(estadisticas_nombres.a_json(st, args.bucket), f, ensure_ascii=False, indent=2)
+                e.escribio(stats_json)
+            estado["estadisticas"] = h_stats
+            guardar_estado(args.estado, estado)
+            print("\nEstadísticas del archivo final:")
+            estadisticas_nombres.imprimir(st, argparse.Namespace(json=False, bucket=args.bucket))
+            print(f"💾 Estadísticas en: {stats_json}")
+    m.guardar(args.metrics)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lectura y escritura incremental de registros de nombres en dos formatos:
+
+- json:  una lista JSON con indent=2 (el formato de siempre; mismos bytes que json.dump).
+- jsonl: un objeto JSON compacto por línea (NDJSON). Se lee y escribe registro a
+         registro, así que la memoria no crece con el tamaño del dataset y los
+         archivos salen más chicos que las listas indentadas.
+
+El formato se deduce de la extensión (.jsonl / .ndjson => jsonl) salvo que se indique.
+Con compacto=True la lista json se escribe sin indentar (un registro compacto por línea).
+
+Backend JSON: el json de la biblioteca estándar por defecto; usar_backend("orjson")
+(o "auto", que lo usa si está instalado) decodifica y codifica con orjson, que da los
+mismos bytes para estos registros (solo difiere en el formato de floats con exponente;
+lo que orjson no sabe codificar, como enteros de más de 64 bits, pasa al json estándar).
+
+leer_serializados() carga los archivos en un pool de procesos y devuelve, en el orden
+de entrada, cada registro ya serializado para la salida (y su clave, si se pide): así el
+parseo y la serialización escalan con los núcleos y el proceso principal solo escribe.
+Los JSONL se reparten en trozos de ~1 MB, así que ningún proceso carga uno entero y la
+memoria queda acotada por 2 * workers trozos en vuelo.
+"""
+
+import io, json, os, shutil, tempfile
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # dependencia opcional
+    orjson = None
+
+FORMATOS = ("json", "jsonl")
+TAM_TROZO_JSONL = 1 << 20
+EXT_JSONL = (".jsonl", ".ndjson")
+BACKENDS = ("json", "orjson", "auto")
+_backend = "json"
+
+def usar_backend(nombre: str = "auto") -> str:
+    """Elige el backend JSON del proceso; devuelve el efectivo ("json" u "orjson")."""
+    global _backend
+    if nombre == "orjson" and orjson is None:
+        raise ValueError("orjson no está instalado (pip install orjson)")
+    _backend = "orjson" if nombre in ("orjson", "auto") and orjson is not None else "json"
+    return _backend
+
+def cargar_json(texto):
+    """json.loads con el backend elegido (acepta str o bytes)."""
+    if _backend == "orjson":
+        return orjson.loads(texto)
+    return json.loads(texto)
+
+def serializar(rec: Dict, formato: str = "json", compacto: bool = False) -> str:
+    """Texto de un registro tal como lo escribe EscritorRegistros (sin separadores de lista)."""
+    indentar = formato == "json" and not compacto
+    if _backend == "orjson":
+        try:
+            texto = orjson.dumps(rec, option=orjson.OPT_INDENT_2 if indentar else 0).decode("utf-8")
+        except orjson.JSONEncodeError:
+            texto = None
+        if texto is not None:
+            return texto.replace("\n", "\n  ") if indentar else texto
+    if indentar:
+        # Igual que json.dump(lista, indent=2): cada elemento indentado dos espacios.
+        return json.dumps(rec, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+    return json.dumps(rec, ensure_ascii=False, separators=(",", ":"))
+
+def formato_de(ruta: str, formato: Optional[str] = None) -> str:
+    if formato:
+        return formato
+    return "jsonl" if os.path.splitext(ruta)[1].lower() in EXT_JSONL else "json"
+
+def extension(formato: str) -> str:
+    return ".jsonl" if formato == "jsonl" else ".json"
+
+def leer_registros(ruta: str, formato: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Itera los registros de un archivo. En jsonl lee línea a línea (ignora líneas vacías).
+    En json carga la lista completa; lanza ValueError si el archivo no contiene una lista.
+    """
+    if formato_de(ruta, formato) == "jsonl":
+        with open(ruta, "r", encoding="utf-8") as f:
+            yield from _registros_jsonl(f, ruta)
+        return
+    with open(ruta, "r", encoding="utf-8") as f:
+        data = cargar_json(f.read()) if _backend == "orjson" else json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f"{ruta} no contiene una lista JSON")
+    yield from data
+
+class LineaInvalida(ValueError):
+    """Línea de un JSONL que no es JSON válido; n es su número de línea (desde 1)."""
+
+    def __init__(self, ruta: str, n: int, detalle: str):
+        super().__init__(f"{ruta}:{n}: línea JSON inválida ({detalle})")
+        self.n, self.detalle = n, detalle
+
+def _registros_jsonl(lineas: Iterable[str], ruta: str) -> Iterator[Dict]:
+    for n, linea in enumerate(lineas, 1):
+        if linea.strip():
+            try:
+                yield cargar_json(linea)
+            except ValueError as e:  # json.JSONDecodeError y orjson.JSONDecodeError
+                raise LineaInvalida(ruta, n, getattr(e, "msg", str(e))) from e
+
+def trozos_jsonl(ruta: str, tam: int = TAM_TROZO_JSONL) -> List[Tuple[int, int]]:
+    """Rangos de bytes [inicio, fin) de unos `tam` bytes que cortan en fin de línea."""
+    total = os.path.getsize(ruta)
+    rangos, inicio = [], 0
+    with open(ruta, "rb") as f:
+        while inicio < total:
+            f.seek(min(inicio + tam, total))
+            f.readline()
+            rangos.append((inicio, f.tell()))
+            inicio = f.tell()
+    return rangos or [(0, 0)]
+
+class EscritorRegistros:
+    """
+    Escribe registros uno a uno. Uso:
+        with EscritorRegistros("salida.jsonl") as w:
+            w.escribir(rec)
+    En jsonl cada registro se vuelca al disco en cuanto se escribe.
+    """
+
+    def __init__(self, ruta: str, formato: Optional[str] = None, compacto: bool = False):
+        self.ruta = ruta
+        self.formato = formato_de(ruta, formato)
+        self.compacto = compacto
+        self.total = 0
+        self._f = None
+
+    def __enter__(self):
+        self._f = open(self.ruta, "w", encoding="utf-8")
+        return self
+
+    def escribir(self, rec: Dict) -> None:
+        self.escribir_texto(serializar(rec, self.formato, self.compacto))
+
+    def escribir_texto(self, texto: str) -> None:
+        """Escribe un registro ya serializado con serializar(rec, self.formato, self.compacto)."""
+        if self.formato == "jsonl":
+            self._f.write(texto)
+            self._f.write("\n")
+            self._f.flush()
+        elif self.compacto:
+            self._f.write("[" if self.total == 0 else ",\n")
+            self._f.write(texto)
+        else:
+            self._f.write("[\n  " if self.total == 0 else ",\n  ")
+            self._f.write(texto)
+        self.total += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.formato == "json" and self.compacto:
+            self._f.write("]" if self.total else "[]")
+        elif self.formato == "json":
+            self._f.write("\n]" if self.total else "[]")
+        self._f.close()
+        return False
+
+class EscritorMultiple:
+    """Reparte cada registro entre varios escritores ya abiertos (p. ej. JSON + índice)."""
+
+    def __init__(self, *escritores):
+        self.escritores = escritores
+
+    def escribir(self, rec: Dict) -> None:
+        for w in self.escritores:
+            w.escribir(rec)
+
+def aviso_lectura(ruta: str, error: str, leidos: int) -> str:
+    """Aviso para un archivo que falló al leerse: se omitió entero o se leyó solo en parte."""
+    detalle = error if ruta in error else f"{ruta}: {error}"
+    if leidos:
+        return f"   ⚠️ {detalle}; se leyó solo en parte ({leidos} registros antes del error)."
+    return f"   ⚠️ {detalle}; se omite."
+
+def serializar_archivo(ruta: str, formato: str, compacto: bool = False, clave: Callable = None,
+                       backend: str = "json", solo_claves: bool = False) -> Tuple[List, Optional[str]]:
+    """
+    Lee un archivo y devuelve ([(clave, texto)], error). clave es None sin `clave`; texto es
+    None con solo_claves. Si el archivo falla a mitad de camino (JSONL con una línea inválida)
+    devuelve lo leído hasta ahí y el mensaje, igual que el recorrido secuencial.
+    Se ejecuta en los procesos de leer_serializados().
+    """
+    usar_backend(backend)
+    items = []
+    try:
+        for rec in leer_registros(ruta):
+            items.append((clave(rec) if clave else None,
+                          None if solo_claves else serializar(rec, formato, compacto)))
+    except ValueError as e:
+        return items, str(e)
+    return items, None
+
+def serializar_trozo(ruta: str, inicio: int, fin: int, formato: str, compacto: bool = False,
+                     clave: Callable = None, backend: str = "json",
+                     solo_claves: bool = False) -> Tuple[List, int, Optional[str]]:
+    """
+    Como serializar_archivo() para las líneas de un JSONL entre los bytes [inicio, fin)
+    (un rango de trozos_jsonl). Devuelve ([(clave, texto)], n, error): sin error, n es la
+    cantidad de líneas del trozo; con error, el número de la línea inválida dentro del trozo.
+    """
+    usar_backend(backend)
+    with open(ruta, "rb") as f:
+        f.seek(inicio)
+        texto = f.read(fin - inicio).decode("utf-8")
+    lineas = io.StringIO(texto, newline=None)  # mismos saltos de línea que open(..., "r")
+    items = []
+    try:
+        for rec in _registros_jsonl(lineas, ruta):
+            items.append((clave(rec) if clave else None,
+                          None if solo_claves else serializar(rec, formato, compacto)))
+    except LineaInvalida as e:
+        return items, e.n, e.detalle
+    lineas.seek(0)
+    return items, sum(1 for _ in lineas), None
+
+def leer_serializados(rutas: Iterable[str], formato: str, compacto: bool = False, clave: Callable = None,
+                      workers: int = 0, solo_claves: bool = False) -> Iterator[Tuple[str, List, Optional[str]]]:
+    """
+    (ruta, [(clave, texto)], error) en el orden de `rutas`, con la carga y la serialización
+    repartidas en un pool de procesos: una tupla por archivo JSON y una por trozo de cada
+    JSONL (así que una misma ruta puede venir varias veces seguidas). Tras un error no
+    vienen más trozos de ese archivo, igual que en el recorrido secuencial. Hay a lo sumo
+    2 * workers tareas en vuelo, así que la memoria no crece con el tamaño ni la cantidad
+    de archivos (salvo un JSON de lista, que como en leer_registros se carga entero).
+    `clave` debe poder enviarse a otro proceso (función de módulo o functools.partial).
+    """
+    tareas = [(ruta, rango) for ruta in rutas
+              for rango in (trozos_jsonl(ruta) if formato_de(ruta) == "jsonl" else [None])]
+    workers = workers or os.cpu_count() or 1
+    lineas_previas, fallidos = {}, set()
+    with ProcessPoolExecutor(max_workers=min(workers, max(1, len(tareas)))) as pool:
+        pendientes = deque()
+
+        def siguiente():
+            ruta, rango, fut = pendientes.popleft()
+            if ruta in fallidos:
+                return None
+            if rango is None:
+                items, error = fut.result()
+                return ruta, items, error
+            items, n, detalle = fut.result()
+            base = lineas_previas.get(ruta, 0)
+            if detalle is not None:
+                fallidos.add(ruta)
+                return ruta, items, str(LineaInvalida(ruta, base + n, detalle))
+            lineas_previas[ruta] = base + n
+            return ruta, items, None
+
+        for ruta, rango in tareas:
+            if rango is None:
+                fut = pool.submit(serializar_archivo, ruta, formato, compacto, clave, _backend, solo_claves)
+            else:
+                fut = pool.submit(serializar_trozo, ruta, *rango, formato, compacto, clave, _backend, solo_claves)
+            pendientes.append((ruta, rango, fut))
+            if len(pendientes) >= 2 * workers:
+                lote = siguiente()
+                if lote:
+                    yield lote
+        while pendientes:
+            lote = siguiente()
+            if lote:
+                yield lote
+
+def comprobar_reemplazo(out_dir: str, marca: str, entradas: Iterable[str] = ()) -> None:
+    """
+    Lanza ValueError si reemplazar out_dir entero podría borrar algo ajeno: solo se
+    reemplaza una carpeta que no existe, vacía o con la `marca` de una salida anterior
+    de la misma herramienta (p. ej. manifiesto.json), y nunca si contiene una entrada.
+    """
+    if os.path.exists(out_dir) and not os.path.isdir(out_dir):
+        raise ValueError(f"{out_dir} existe y no es una carpeta")
+    if os.path.isdir(out_dir) and os.listdir(out_dir) and not os.path.isfile(os.path.join(out_dir, marca)):
+        raise ValueError(f"{out_dir} no está vacía ni contiene {marca}: no se reemplaza")
+    raiz = os.path.realpath(out_dir)
+    for ruta in entradas:
+        if ruta and os.path.commonpath([raiz, os.path.realpath(ruta)]) == raiz:
+            raise ValueError(f"la entrada {ruta} está dentro de {out_dir}: no se reemplaza")
+
+@contextmanager
+def reemplazar_directorio(out_dir: str, marca: str, entradas: Iterable[str] = (),
+                          prefijo: str = ".tmp-") -> Iterator[str]:
+    """
+    Da una carpeta temporal junto a out_dir para construir la salida; si el bloque
+    termina bien, reemplaza out_dir entero por ella, y si falla, la borra. Quien lee
+    out_dir nunca ve una salida a medio escribir. Antes comprueba con
+    comprobar_reemplazo() que out_dir se pueda borrar.
+    """
+    comprobar_reemplazo(out_dir, marca, entradas)
+    tmp = tempfile.mkdtemp(prefix=prefijo, dir=os.path.dirname(os.path.abspath(out_dir)))
+    try:
+        os.chmod(tmp, 0o755)  # mkdtemp crea con 0o700
+        yield tmp
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    os.replace(tmp, out_dir)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Servidor HTTP local (asyncio, solo biblioteca estándar) que mantiene el generador
+cargado y responde entradas como las de procesar_fila sin arrancar un proceso por nombre.
+
+Se inicia desde el generador:
+    py generador_nombres.py --serve 8765 [--host 127.0.0.1] [--seed 42] [--types poetica] [--serve-lru 10000]
+
+Rutas:
+  GET  /nombre?nombre=Sofía&origen=Griego&genero=F[&seed=42][&types=poetica,biblica]
+  POST /lote         {"filas": [{"nombre": "Sofía", "origen": "Griego", "genero": "F"}, ...],
+                      "seed": 42, "types": ["poetica"]}     (seed y types opcionales)
+  GET  /estadisticas  peticiones, latencia (media, p50, p95, p99, máx.) y aciertos de la caché
+  GET  /salud
+
+Cada nombre usa la semilla por nombre (rng_para_nombre), así que la respuesta depende
+solo de (nombre, origen, genero, seed, types) y no del orden de las peticiones: es la
+clave de la caché LRU acotada que hay delante del generador. Las conexiones son
+keep-alive (HTTP/1.1), así que una petición cacheada no paga ni el handshake TCP.
+"""
+
+import asyncio, json, sys, time
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import base_conocimiento
+import generador_nombres
+from registros_io import serializar, usar_backend
+
+TAM_LRU = 10_000
+MAX_LOTE = 1_000
+MAX_CUERPO = 1 << 20
+MUESTRAS_LATENCIA = 10_000
+MENSAJES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+class ErrorPeticion(Exception):
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+class ServidorNombres:
+    def __init__(self, seed: int = 42, tipos: List[str] = (), tam_lru: int = TAM_LRU):
+        self.seed = seed
+        self.tipos = tuple(generador_nombres.tipos_preferidos(tipos))
+        self.tam_lru = tam_lru
+        self._generar = lru_cache(maxsize=tam_lru)(self._generar_sin_cache)
+        self.inicio = time.time()
+        self.peticiones = Counter()
+        self.errores = 0
+        self._latencias = deque(maxlen=MUESTRAS_LATENCIA)
+
+    def calentar(self) -> None:
+        """Abre la base de conocimiento y pasa un nombre por el motor antes de aceptar conexiones."""
+        base_conocimiento.base_por_defecto()
+        self._generar_sin_cache("Ana", "Hebreo", "F", self.seed, self.tipos)
+
+    # --- generación -------------------------------------------------------
+
+    @staticmethod
+    def _generar_sin_cache(nombre: str, origen: str, genero: str, seed: int, tipos: Tuple[str, ...]) -> str:
+        row = {"Nombre": nombre, "Origen": origen, "Género": genero}
+        return serializar(generador_nombres.procesar_fila(row, list(tipos), seed), "jsonl")
+
+    def generar(self, fila: Dict, seed: Optional[int] = None, tipos: Optional[List[str]] = None) -> str:
+        """JSON compacto de la entrada de una fila (claves y limpieza iguales que en procesar_fila)."""
+        if not isinstance(fila, dict):
+            raise ErrorPeticion(400, "cada fila debe ser un objeto JSON")
+        nombre = str(fila.get("Nombre") or fila.get("nombre") or "").strip()
+        if not nombre:
+            raise ErrorPeticion(400, "falta 'nombre'")
+        genero = str(fila.get("Género") or fila.get("Genero") or fila.get("genero") or "U").strip()
+        origen = str(fila.get("Origen") or fila.get("origen") or "Desconocido").strip()
+        tipos = self.tipos if tipos is None else tuple(generador_nombres.tipos_preferidos(tipos))
+        return self._generar(nombre, origen, genero, self.seed if seed is None else seed, tipos)
+
+    # --- rutas ------------------------------------------------------------
+
+    def despachar(self, metodo: str, destino: str, cuerpo: bytes) -> Tuple[int, str]:
+        url = urlsplit(destino)
+        if url.path == "/nombre":
+            if metodo != "GET":
+                raise ErrorPeticion(405, "usar GET")
+            q = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            tipos = [t for t in q["types"].split(",") if t] if "types" in q else None
+            return 200, self.generar(q, _entero(q.get("seed")), tipos)
+        if url.path == "/lote":
+            if metodo != "POST":
+                raise ErrorPeticion(405, "usar POST")
+            try:
+                datos = json.loads(cuerpo or b"{}")
+            except ValueError:
+                raise ErrorPeticion(400, "cuerpo JSON inválido")
+            filas = datos.get("filas") if isinstance(datos, dict) else datos
+            if not isinstance(filas, list):
+                raise ErrorPeticion(400, "se esperaba 'filas': [...]")
+            if len(filas) > MAX_LOTE:
+                raise ErrorPeticion(413, f"a lo sumo {MAX_LOTE} filas por lote")
+            seed = _entero(datos.get("seed")) if isinstance(datos, dict) else None
+            tipos = _tipos(datos.get("types")) if isinstance(datos, dict) else None
+            return 200, '{"resultados":[' + ",".join(self.generar(f, seed, tipos) for f in filas) + "]}"
+        if url.path == "/estadisticas":
+            return 200, json.dumps(self.estadisticas(), ensure_ascii=False)
+        if url.path == "/salud":
+            return 200, '{"ok":true}'
+        raise ErrorPeticion(404, f"ruta desconocida: {url.path}")
+
+    def estadisticas(self) -> Dict:
+        info = self._generar.cache_info()
+        consultas = info.hits + info.misses
+        lat = sorted(self._latencias)
+        pct = lambda p: round(lat[min(len(lat) - 1, int(p * len(lat)))] * 1000, 4) if lat else None
+        return {
+            "uptime_s": round(time.time() - self.inicio, 1),
+            "peticiones": sum(self.peticiones.values()), "por_ruta": dict(self.peticiones),
+            "errores": self.errores,
+            "cache": {"tam_max": info.maxsize, "entradas": info.currsize, "aciertos": info.hits,
+                      "fallos": info.misses, "tasa_aciertos": round(info.hits / consultas, 4) if consultas else None},
+            "latencia_ms": {"muestras": len(lat),
+                            "media": round(sum(lat) / len(lat) * 1000, 4) if lat else None,
+                            "p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99),
+                            "max": round(lat[-1] * 1000, 4) if lat else None},
+        }
+
+    # --- HTTP -------------------------------------------------------------
+
+    async def atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                t = time.perf_counter()
+                partes = linea.decode("latin-1").split()
+                cabeceras = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    cabeceras[k.strip().lower()] = v.strip()
+                conexion = cabeceras.get("connection", "").lower()
+                cerrar = conexion == "close" or (len(partes) == 3 and partes[2] == "HTTP/1.0" and conexion != "keep-alive")
+                try:
+                    if len(partes) != 3:
+                        cerrar = True
+                        raise ErrorPeticion(400, "línea de petición inválida")
+                    largo = _entero(cabeceras.get("content-length")) or 0
+                    if largo > MAX_CUERPO:
+                        cerrar = True
+                        raise ErrorPeticion(413, "cuerpo demasiado grande")
+                    cuerpo = await reader.readexactly(largo) if largo else b""
+                    estado, texto = self.despachar(partes[0], partes[1], cuerpo)
+                except ErrorPeticion as e:
+                    estado, texto = e.estado, json.dumps({"error": str(e)}, ensure_ascii=False)
+                except Exception as e:  # un error del motor no debe tirar el servidor
+                    estado, texto = 500, json.dumps({"error": repr(e)}, ensure_ascii=False)
+                datos = texto.encode("utf-8")
+                writer.write((f"HTTP/1.1 {estado} {MENSAJES.get(estado, '')}\r\n"
+                              f"Content-Type: application/json; charset=utf-8\r\n"
+                              f"Content-Length: {len(datos)}\r\n"
+                              f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n").encode("latin-1") + datos)
+                await writer.drain()
+                ruta = urlsplit(partes[1]).path if len(partes) == 3 else "?"
+                self.peticiones[ruta] += 1
+                self.errores += estado >= 400
+                if ruta != "/estadisticas":
+                    self._latencias.append(time.perf_counter() - t)
+                if cerrar:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+def _entero(valor) -> Optional[int]:
+    if valor is None or valor == "":
+        return None
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ErrorPeticion(400, f"se esperaba un entero: {valor!r}")
+
+def _tipos(valor) -> Optional[List[str]]:
+    if valor is None:
+        return None
+    if not isinstance(valor, list) or not all(isinstance(t, str) for t in valor):
+        raise ErrorPeticion(400, "'types' debe ser una lista de textos")
+    return valor
+
+async def _servir(servidor: ServidorNombres, host: str, puerto: int) -> None:
+    srv = await asyncio.start_server(servidor.atender, host, puerto)
+    print(f"🌐 Sirviendo en http://{host}:{puerto} (seed={servidor.seed}, LRU={servidor.tam_lru}); Ctrl+C para salir")
+    async with srv:
+        await srv.serve_forever()
+
+def servir(host: str = "127.0.0.1", puerto: int = 8765, seed: int = 42, tipos: List[str] = (),
+           tam_lru: int = TAM_LRU) -> None:
+    usar_backend("auto")  # mismos bytes que json estándar para estas entradas; orjson si está
+    servidor = ServidorNombres(seed, tipos, tam_lru)
+    servidor.calentar()
+    try:
+        asyncio.run(_servir(servidor, host, puerto))
+    except KeyboardInterrupt:
+        print("\n" + json.dumps(servidor.estadisticas(), ensure_ascii=False), file=sys.stderr)
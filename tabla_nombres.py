@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tabla columnar y compacta de registros de nombres, para tener en memoria
+cientos de miles de entradas (uniones grandes, pipeline_nombres.py).
+
+Cada registro del formato habitual
+    {"nombre", "genero", "origen", "significado", "historia": {"tipo", "relato"}}
+se guarda por columnas:
+- nombre:                 lista de str.
+- genero, origen, tipo:   categóricas; un código por fila en un array('I') y los
+                          valores distintos (internados) una sola vez.
+- significado y relato:   UTF-8 en trozos de ~256 KB comprimidos con zlib. Los textos
+                          salen de plantillas y se repiten mucho entre nombres, así que
+                          comprimen más de 10x; se descomprime un trozo a la vez al leer.
+
+Los registros que no siguen exactamente ese esquema (otros campos, otro orden,
+valores que no son str) se guardan tal cual aparte, así que a_dict() devuelve
+siempre el registro original y la salida serializada no cambia.
+
+Uso:
+    tabla = cargar(["public/data/nombres_completos.json"])
+    for fila in tabla:            # vistas livianas con .get() (sirven para make_key)
+        rec = fila.a_dict()
+"""
+
+import sys, zlib
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from registros_io import leer_registros
+
+CAMPOS = ["nombre", "genero", "origen", "significado", "historia"]
+CAMPOS_HISTORIA = ["tipo", "relato"]
+TAM_TROZO = 1 << 18
+NIVEL_ZLIB = 1
+
+class Categorias:
+    """Valores distintos de una columna categórica; cada uno se guarda una sola vez."""
+
+    def __init__(self):
+        self.valores: List[str] = []
+        self._codigos: Dict[str, int] = {}
+
+    def codigo(self, valor: str) -> int:
+        c = self._codigos.get(valor)
+        if c is None:
+            c = self._codigos[valor] = len(self.valores)
+            self.valores.append(sys.intern(valor))
+        return c
+
+class TextosComprimidos:
+    """Columna de textos largos: se acumulan en UTF-8 y se comprimen por trozos."""
+
+    def __init__(self, tam_trozo: int = TAM_TROZO):
+        self.tam_trozo = tam_trozo
+        self._trozos: List[bytes] = []
+        self._actual = bytearray()
+        self._trozo = array("I")   # trozo de cada texto
+        self._inicio = array("I")  # offset dentro del trozo descomprimido
+        self._largo = array("I")
+        self._cache = (-1, b"")
+
+    def __len__(self) -> int:
+        return len(self._largo)
+
+    def agregar(self, texto: str) -> None:
+        self.agregar_utf8(texto.encode("utf-8"))
+
+    def agregar_utf8(self, datos: bytes) -> None:
+        self._trozo.append(len(self._trozos))
+        self._inicio.append(len(self._actual))
+        self._largo.append(len(datos))
+        self._actual += datos
+        if len(self._actual) >= self.tam_trozo:
+            self._cerrar_trozo()
+
+    def _cerrar_trozo(self) -> None:
+        self._trozos.append(zlib.compress(bytes(self._actual), NIVEL_ZLIB))
+        self._actual = bytearray()
+
+    def _datos(self, n: int) -> bytes:
+        if n == len(self._trozos):
+            return self._actual
+        if self._cache[0] != n:
+            self._cache = (n, zlib.decompress(self._trozos[n]))
+        return self._cache[1]
+
+    def __getitem__(self, i: int) -> str:
+        ini = self._inicio[i]
+        return self._datos(self._trozo[i])[ini:ini + self._largo[i]].decode("utf-8")
+
+    def bytes_en_memoria(self) -> int:
+        return sum(len(t) for t in self._trozos) + len(self._actual) + 12 * len(self)
+
+class TablaNombres:
+    def __init__(self, registros: Iterable[Dict] = ()):
+        self.nombre: List[str] = []
+        self.genero, self.origen, self.tipo = array("I"), array("I"), array("I")
+        self.significado, self.relato = TextosComprimidos(), TextosComprimidos()
+        self.categorias = {c: Categorias() for c in ("genero", "origen", "tipo")}
+        self.extras: Dict[int, Dict] = {}  # fila -> registro original que no sigue el esquema
+        for rec in registros:
+            self.agregar(rec)
+
+    def __len__(self) -> int:
+        return len(self.nombre)
+
+    def agregar(self, rec: Dict) -> None:
+        # Todo lo que puede fallar (validar, codificar) se hace antes de tocar las columnas,
+        # así que todas quedan siempre del mismo largo.
+        fila = self._fila_en_esquema(rec)
+        i = len(self.nombre)
+        if fila is None:
+            # Fuera de esquema: columnas con valores neutros para mantener la alineación.
+            self.extras[i] = rec
+            fila = ("", 0, 0, 0, b"", b"")
+        nombre, genero, origen, tipo, significado, relato = fila
+        self.nombre.append(nombre)
+        self.genero.append(genero)
+        self.origen.append(origen)
+        self.tipo.append(tipo)
+        self.significado.agregar_utf8(significado)
+        self.relato.agregar_utf8(relato)
+
+    def _fila_en_esquema(self, rec) -> Optional[tuple]:
+        """Valores listos para las columnas, o None si el registro no sigue el esquema."""
+        historia = rec.get("historia") if isinstance(rec, dict) else None
+        if not (isinstance(historia, dict) and list(rec) == CAMPOS and list(historia) == CAMPOS_HISTORIA
+                and all(isinstance(rec[c], str) for c in CAMPOS[:4])
+                and all(isinstance(historia[c], str) for c in CAMPOS_HISTORIA)):
+            return None
+        try:
+            significado = rec["significado"].encode("utf-8")
+            relato = historia["relato"].encode("utf-8")
+        except UnicodeEncodeError:  # p. ej. surrogates sueltos: se guarda tal cual
+            return None
+        return (rec["nombre"], self.categorias["genero"].codigo(rec["genero"]),
+                self.categorias["origen"].codigo(rec["origen"]), self.categorias["tipo"].codigo(historia["tipo"]),
+                significado, relato)
+
+    def valor(self, i: int, campo: str, default=None):
+        if i in self.extras:
+            rec = self.extras[i]
+            return rec.get(campo, default) if isinstance(rec, dict) else default
+        if campo == "nombre":
+            return self.nombre[i]
+        if campo in ("genero", "origen"):
+            return self.categorias[campo].valores[getattr(self, campo)[i]]
+        if campo == "significado":
+            return self.significado[i]
+        if campo == "historia":
+            return {"tipo": self.categorias["tipo"].valores[self.tipo[i]], "relato": self.relato[i]}
+        return default
+
+    def a_dict(self, i: int) -> Dict:
+        """Registro i como dict, con los mismos campos y orden que el original."""
+        if i in self.extras:
+            return self.extras[i]
+        return {c: self.valor(i, c) for c in CAMPOS}
+
+    def __getitem__(self, i: int) -> "Fila":
+        if not -len(self) <= i < len(self):
+            raise IndexError(i)
+        return Fila(self, i % len(self))
+
+    def __iter__(self) -> Iterator["Fila"]:
+        for i in range(len(self)):
+            yield Fila(self, i)
+
+    def registros(self, indices: Optional[Iterable[int]] = None) -> Iterator[Dict]:
+        for i in (range(len(self)) if indices is None else indices):
+            yield self.a_dict(i)
+
+    def bytes_en_memoria(self) -> int:
+        """Estimación de la memoria de la tabla (sin contar el intérprete)."""
+        n = sum(sys.getsizeof(s) for s in self.nombre) + sys.getsizeof(self.nombre)
+        n += sum(col.itemsize * len(col) for col in (self.genero, self.origen, self.tipo))
+        n += sum(sys.getsizeof(v) for cat in self.categorias.values() for v in cat.valores)
+        return n + self.significado.bytes_en_memoria() + self.relato.bytes_en_memoria()
+
+class Fila:
+    """Vista de una fila; get() imita dict.get para reutilizar make_key y compañía."""
+    __slots__ = ("tabla", "indice")
+
+    def __init__(self, tabla: TablaNombres, indice: int):
+        self.tabla = tabla
+        self.indice = indice
+
+    def get(self, campo: str, default=None):
+        return self.tabla.valor(self.indice, campo, default)
+
+    def __contains__(self, campo: str) -> bool:
+        return self.get(campo, Fila) is not Fila
+
+    def a_dict(self) -> Dict:
+        return self.tabla.a_dict(self.indice)
+
+class EscritorDeFilas:
+    """Adapta un escritor de dicts (EscritorRegistros...) para recibir filas de una tabla."""
+
+    def __init__(self, escritor):
+        self.escritor = escritor
+
+    def escribir(self, fila: Fila) -> None:
+        self.escritor.escribir(fila.a_dict())
+
+def cargar(rutas: Iterable[str]) -> TablaNombres:
+    """Carga JSON/JSONL del formato habitual en una tabla compacta, en orden."""
+    tabla = TablaNombres()
+    for ruta in rutas:
+        for rec in leer_registros(ruta):
+            tabla.agregar(rec)
+    return tabla
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+base_por_defecto() debe funcionar aunque la carpeta del módulo no se pueda escribir:
+primero en la caché del usuario y, si tampoco, en memoria.
+
+Uso:
+  py -m pytest test_base_conocimiento.py
+"""
+
+import os
+
+import pytest
+
+import base_conocimiento
+
+@pytest.fixture
+def sin_carpeta_del_modulo(tmp_path, monkeypatch):
+    # Un archivo común como "carpeta": no se puede escribir debajo ni siendo root.
+    bloqueo = tmp_path / "bloqueo"
+    bloqueo.write_text("")
+    monkeypatch.setattr(base_conocimiento, "RUTA_DB", str(bloqueo / "datos_especificos.sqlite"))
+    monkeypatch.delenv("LOCALAPPDATA", raising=False)
+    monkeypatch.setattr(base_conocimiento, "_base", None)
+    return bloqueo
+
+def test_cae_a_la_cache_del_usuario(sin_carpeta_del_modulo, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    base = base_conocimiento.base_por_defecto()
+    try:
+        assert base.ruta_db == base_conocimiento.ruta_cache()
+        assert base.ruta_db.startswith(str(tmp_path / "cache"))
+        assert os.path.isfile(base.ruta_db)
+        assert base.obtener("alejandro")["etimologia"]
+    finally:
+        base.cerrar()
+
+def test_cae_a_memoria(sin_carpeta_del_modulo, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(sin_carpeta_del_modulo))
+    base = base_conocimiento.base_por_defecto()
+    try:
+        assert base.ruta_db == ":memory:"
+        assert base.obtener("alejandro")["etimologia"]
+        assert base.obtener("no-existe") is None
+    finally:
+        base.cerrar()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+procesar_fila con semilla fija: el motor precompilado debe dar exactamente las mismas
+entradas que el generador original (las huellas de abajo salieron de la versión base,
+con random.seed(42)), y la semilla por nombre no debe cambiar sin querer.
+
+Uso:
+  py -m pytest test_generador_nombres.py
+"""
+
+import hashlib, json, random
+
+import pytest
+
+import generador_nombres
+
+FILAS = [
+    {"Nombre": "Alejandro", "Género": "M", "Origen": "Griego"},
+    {"Nombre": "César", "Género": "M", "Origen": "Latino"},
+    {"nombre": "margarita", "genero": "F", "origen": "Latino"},
+    {"Nombre": "Sofía", "Género": "F", "Origen": "Griego"},
+    {"Nombre": "  María   José ", "Genero": "F", "Origen": "Hebreo"},
+    {"Nombre": "Zoë", "Género": "F"},
+    {"Nombre": "Luis", "Origen": "Germánico"},
+    {"Nombre": "   ", "Género": "M", "Origen": "Griego"},
+    {"Nombre": "Ñuño", "Género": "M", "Origen": "Vasco"},
+    {"Nombre": "Berna", "Género": "U", "Origen": "Germánico"},
+]
+
+def huella(entradas) -> str:
+    return hashlib.sha256(json.dumps(entradas, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+def corrida(preferidos, filas=FILAS, **kw):
+    random.seed(42)
+    return [generador_nombres.procesar_fila(f, preferidos, **kw) for f in filas]
+
+@pytest.mark.parametrize("preferidos, esperada", [
+    ([], "a9c7979e4a00ab84f9fa3edb0cb7f54a964ae059cee0b06fbdcf2ae5b4fa3fb9"),
+    (["bíblica", "poética"], "f291987375c524d51c43d3ac962b109de0e4165e7fc5b1017209a98c836fd300"),
+])
+def test_igual_al_generador_original(preferidos, esperada):
+    entradas = corrida(preferidos)
+    assert entradas[7] is None  # fila sin nombre
+    assert huella(entradas) == esperada
+
+@pytest.mark.parametrize("preferidos, esperada", [
+    ([], "d05c5fd46b20a95ba79e96afedd6493d77cecaca2f994ba77d4284a9a7a2b7c3"),
+    (["bíblica", "poética"], "0748dd449780d630b808d3b49dae72a6daa915835f6c2f4642dbe1afaf07c295"),
+])
+def test_semilla_por_nombre(preferidos, esperada):
+    entradas = corrida(preferidos, seed=7)
+    assert huella(entradas) == esperada
+    # Cada nombre usa su propio generador: el orden de las filas no cambia su entrada.
+    assert corrida(preferidos, FILAS[::-1], seed=7) == entradas[::-1]
+
+def test_generar_lote_descarta_filas_sin_nombre():
+    random.seed(42)
+    lote = list(generador_nombres.generar_lote(FILAS, []))
+    assert lote == [e for e in corrida([]) if e]
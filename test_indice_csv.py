@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+leer_desde(csv, skip) debe dar exactamente las mismas filas que
+list(csv.DictReader(open(csv)))[skip:], también con campos multilínea y comillas raras.
+
+Uso:
+  py -m pytest test_indice_csv.py
+"""
+
+import csv
+
+import pytest
+
+import indice_csv
+
+CASOS = {
+    "simple": "Nombre,Género,Origen,Significado\nAna,F,Hebreo,gracia\nLuis,M,Germánico,guerrero\n",
+    "multilinea": ('Nombre,Género,Origen,Significado\n'
+                   'Sofía,F,Griego,"sabiduría,\nprimera línea\nsegunda"\n'
+                   'Ana,F,Hebreo,"dice ""gracia""\ny sigue"\n'
+                   'Luis,M,Germánico,guerrero\n'),
+    "comilla_suelta": ('Nombre,Género,Origen,Significado\n'
+                       'O"Brien,M,y,z\n'
+                       'Ana,F,Hebreo,gracia\n'
+                       'Luis,M,Germánico,"a\nb"\n'),
+    "lineas_vacias_y_crlf": ('Nombre,Género,Origen,Significado\r\n'
+                             '\r\n'
+                             'Ana,F,Hebreo,"uno\r\ndos"\r\n'
+                             '\r\n'
+                             'Ñandú,U,Guaraní,ave\r\n'),
+    "sin_salto_final": "Nombre,Género,Origen,Significado\nAna,F,Hebreo,gracia\nLuis,M,Germánico,guerrero",
+    "solo_cabecera": "Nombre,Género,Origen,Significado\n",
+    "vacio": "",
+}
+
+@pytest.mark.parametrize("caso", sorted(CASOS))
+def test_leer_desde_equivale_a_dictreader(tmp_path, caso):
+    ruta = tmp_path / "nombres.csv"
+    ruta.write_bytes(CASOS[caso].encode("utf-8"))
+    with open(ruta, "r", encoding="utf-8") as f:
+        esperado = list(csv.DictReader(f))
+    for skip in range(len(esperado) + 2):
+        assert list(indice_csv.leer_desde(str(ruta), skip)) == esperado[skip:], (caso, skip)
+
+def test_indice_se_reconstruye_si_cambia_el_csv(tmp_path):
+    ruta = tmp_path / "nombres.csv"
+    ruta.write_text(CASOS["simple"], encoding="utf-8")
+    assert indice_csv.construir_indice(str(ruta)) == 2
+    ruta.write_text(CASOS["simple"] + "Sofía,F,Griego,sabiduría\n", encoding="utf-8")
+    assert not indice_csv.indice_vigente(str(ruta))
+    assert [r["Nombre"] for r in indice_csv.leer_desde(str(ruta), 2)] == ["Sofía"]
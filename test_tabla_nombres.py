@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TablaNombres.a_dict debe devolver exactamente el registro original (mismos campos,
+orden y valores), también para los registros fuera de esquema y a través de varios
+trozos comprimidos.
+
+Uso:
+  py -m pytest test_tabla_nombres.py
+"""
+
+import glob, json, os
+
+import tabla_nombres
+from registros_io import leer_registros
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+
+def en_esquema(nombre, genero="F", origen="Griego", tipo="poética", relato=""):
+    return {"nombre": nombre, "genero": genero, "origen": origen, "significado": f"Significado de {nombre} ✨",
+            "historia": {"tipo": tipo, "relato": relato}}
+
+FUERA_DE_ESQUEMA = [
+    {"nombre": "Ana", "genero": "F", "origen": "Hebreo", "significado": "gracia",
+     "historia": {"tipo": "bíblica", "relato": ""}, "extra": 1},                     # campo de más
+    {"genero": "M", "nombre": "Luis", "origen": "x", "significado": "y",
+     "historia": {"tipo": "histórica", "relato": ""}},                                # otro orden
+    {"nombre": 7, "genero": "U", "origen": "x", "significado": "y",
+     "historia": {"tipo": "poética", "relato": ""}},                                  # no es str
+    {"nombre": "Sol", "genero": "F", "origen": "x", "significado": "y", "historia": None},
+    {"nombre": "Raro", "genero": "F", "origen": "x", "significado": "\ud800",
+     "historia": {"tipo": "poética", "relato": ""}},                                  # surrogate suelto
+    ["no", "es", "un", "dict"],
+    {},
+]
+
+def test_ida_y_vuelta():
+    registros = [en_esquema("Sofía"), *FUERA_DE_ESQUEMA, en_esquema("Zoë", "U", "Griego", "mitológica", "Érase…"),
+                 en_esquema("Sofía")]
+    tabla = tabla_nombres.TablaNombres(registros)
+    assert len(tabla) == len(registros)
+    for i, rec in enumerate(registros):
+        assert json.dumps(tabla[i].a_dict()) == json.dumps(rec)  # valores y orden de campos
+    assert list(tabla.registros()) == registros
+    assert list(tabla.registros([9, 0])) == [registros[9], registros[0]]
+    assert tabla[-1].get("nombre") == "Sofía" and "historia" in tabla[0] and "extra" not in tabla[0]
+
+def test_ida_y_vuelta_de_los_bloques_del_repo():
+    rutas = sorted(glob.glob(os.path.join(AQUI, "nombres_*.json")))
+    originales = [rec for ruta in rutas for rec in leer_registros(ruta)]
+    tabla = tabla_nombres.cargar(rutas)
+    assert len(tabla.significado._trozos) > 1  # el recorrido cruza varios trozos comprimidos
+    # Misma serialización byte a byte, orden de campos incluido.
+    assert (json.dumps(list(tabla.registros()), ensure_ascii=False, indent=2)
+            == json.dumps(originales, ensure_ascii=False, indent=2))
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+unir_json_nombres_dedupe.py: la unión en streaming (secuencial y con --workers) debe dar
+la misma salida y el mismo reporte que el algoritmo original en memoria, con --keep first
+y --keep last; y los casi duplicados del reporte (--near-dups).
+
+Uso:
+  py -m pytest test_unir_json_nombres_dedupe.py
+"""
+
+import io, json, sys
+from functools import partial
+
+import pytest
+
+import registros_io
+import unir_json_nombres_dedupe
+from unir_json_nombres_dedupe import casi_duplicados, clave_fonetica, escribir_reporte, make_key
+
+# Orden natural: extra_1 < nombres_2 < nombres_10. Duplicados por acentos, mayúsculas,
+# espacios, claves no textuales y registros sin clave, dentro de un archivo y entre archivos.
+ENTRADAS = {
+    "nombres_10.json": [{"nombre": "Sofía", "genero": "F", "n": 1}, {"nombre": "Luis", "n": 2},
+                        {"nombre": "ANA", "n": 3}, {"nombre": 7, "n": 4}, {"n": 5}],
+    "nombres_2.json": [{"nombre": "sofia", "n": 6}, {"nombre": " Ana ", "n": 7},
+                       {"nombre": "Mateo", "n": 8}, {"nombre": "mateo", "n": 9}, {"nombre": "7", "n": 10}],
+    "extra_1.json": [{"nombre": "Luis", "n": 11}, {"n": 12}, {"nombre": "Zoë", "n": 13}],
+}
+
+def dedupe_original(rutas, keep):
+    """El algoritmo anterior (todo en memoria), tal como estaba en la versión base."""
+    out = []
+    for ruta in rutas:
+        with open(ruta, "r", encoding="utf-8") as f:
+            out.extend(json.load(f))
+    idx_by_key, dups = {}, []
+    for i, rec in enumerate(out):
+        k = make_key(rec, "nombre", False, False)
+        if k in idx_by_key:
+            dups.append((k, idx_by_key[k], i))
+            if keep == "last":
+                idx_by_key[k] = i
+        else:
+            idx_by_key[k] = i
+    keep_indices = set(idx_by_key.values())
+    nuevo = [rec for i, rec in enumerate(out) if i in keep_indices]
+    reporte = (f"Duplicados detectados: {len(out) - len(nuevo)}\n"
+               f"Clave: nombre, keep={keep}, case_sensitive=False, keep_accents=False\n\n"
+               + "".join(f"{k}  (primer: {a}, duplicado: {b})\n" for k, a, b in dups))
+    return json.dumps(nuevo, ensure_ascii=False, indent=2), reporte
+
+@pytest.mark.parametrize("entrada", ["json", "jsonl"])
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("keep", ["first", "last"])
+def test_igual_al_algoritmo_original(tmp_path, monkeypatch, keep, workers, entrada):
+    for nombre, registros in ENTRADAS.items():
+        (tmp_path / nombre).write_text(json.dumps(registros, ensure_ascii=False), encoding="utf-8")
+        # Misma lista como JSONL, con una línea en blanco entre registros.
+        (tmp_path / (nombre + "l")).write_text(
+            "".join(json.dumps(r, ensure_ascii=False) + "\n\n" for r in registros), encoding="utf-8")
+    esperado, reporte = dedupe_original([tmp_path / n for n in ("extra_1.json", "nombres_2.json",
+                                                                 "nombres_10.json")], keep)
+    # Trozos de JSONL diminutos: cada registro llega al pool en varios lotes.
+    monkeypatch.setattr(registros_io, "trozos_jsonl", partial(registros_io.trozos_jsonl, tam=16))
+    monkeypatch.setattr(sys, "argv", ["unir_json_nombres_dedupe.py", "--out", str(tmp_path / "salida.json"),
+                                      "--keep", keep, "--workers", str(workers),
+                                      "--report", str(tmp_path / "reporte.txt"), str(tmp_path / f"*.{entrada}")])
+    unir_json_nombres_dedupe.main()
+    assert (tmp_path / "salida.json").read_text(encoding="utf-8") == esperado
+    assert (tmp_path / "reporte.txt").read_text(encoding="utf-8") == reporte
+
+CLAVES = ["sofia", "sophia", "ana", "anna", "elena", "helena", "mateo", "matteo",
+          "cristian", "christian", "isabel", "isabella", "pedro"]
+
+def pares(casi):
+    return {(a, b) for _, a, _, b, _ in casi}
+
+def test_ch_no_separa_bloques():
+    assert clave_fonetica("Cristian") == clave_fonetica("Christian")
+    assert clave_fonetica("Sasha") == clave_fonetica("Sacha")
+
+def test_umbral_se_mide_sobre_las_claves():
+    claves = {k: i for i, k in enumerate(CLAVES)}
+    por_defecto = pares(casi_duplicados(claves))
+    assert {("sofia", "sophia"), ("ana", "anna"), ("elena", "helena"), ("mateo", "matteo"),
+            ("christian", "cristian"), ("isabel", "isabella")} <= por_defecto
+    # Misma forma fonética no es similitud 1.0: un umbral alto los deja fuera.
+    assert casi_duplicados(claves, umbral=0.99) == []
+    assert pares(casi_duplicados(claves, umbral=0.9)) == {("elena", "helena"), ("mateo", "matteo"),
+                                                           ("christian", "cristian")}
+
+def test_seccion_del_reporte(tmp_path):
+    claves = {"sofia": 0, "sophia": 1, "pedro": 2}
+    dups = io.StringIO("sofia  (primer: 0, duplicado: 3)\n")
+    ruta = tmp_path / "reporte.txt"
+    escribir_reporte(str(ruta), 1, dups, "nombre", "first", False, False, casi_duplicados(claves), 0.7)
+    assert ruta.read_text(encoding="utf-8") == (
+        "Duplicados detectados: 1\n"
+        "Clave: nombre, keep=first, case_sensitive=False, keep_accents=False\n\n"
+        "sofia  (primer: 0, duplicado: 3)\n"
+        "\nCasi duplicados (umbral=0.7): 1\n\n"
+        "sofia ~ sophia  (similitud: 0.73, índices: 0, 1)\n")
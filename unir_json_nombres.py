@@ -7,9 +7,21 @@ Uso:
     py unir_json_nombres.py --out nombres_completos.json nombres_*.json
     # o listar explícitos:
     py unir_json_nombres.py --out nombres_completos.json a.json b.json c.json
+    # JSONL (un registro por línea; se lee y escribe en streaming):
+    py unir_json_nombres.py --out nombres_completos.jsonl nombres_*.jsonl
+    # Carga en 8 procesos, con orjson y sin indentar:
+    py unir_json_nombres.py --workers 8 --json-backend orjson --compact --out todo.json nombres_*.json
+
+Con --workers distinto de 1 los archivos (los JSONL, por trozos) se cargan y serializan en
+un pool de procesos (registros_io.leer_serializados); la salida es la misma, en orden
+natural. Con --metrics, "leer" es entonces la espera por los lotes ya serializados.
 """
 
-import json, argparse, glob, os, re, sys
+import argparse, glob, os, re, sys
+
+from metricas import Metricas
+from registros_io import (BACKENDS, EscritorRegistros, FORMATOS, aviso_lectura, leer_registros, leer_serializados,
+                          usar_backend)
 
 def natural_key(s: str):
     # orden "humano": nombres_1_300.json < nombres_51_100.json < ...
@@ -42,7 +54,17 @@ def expand_inputs(tokens, out_path):
 
 def main():
     p = argparse.ArgumentParser(description="Une varios JSON de nombres en uno solo.")
-    p.add_argument("--out", required=True, help="Archivo JSON unificado de salida.")
+    p.add_argument("--out", required=True, help="Archivo JSON/JSONL unificado de salida.")
+    p.add_argument("--format", dest="formato", choices=FORMATOS, default=None,
+                   help="Formato de salida: json o jsonl (default: según extensión de --out).")
+    p.add_argument("--compact", dest="compacto", action="store_true",
+                   help="Lista JSON sin indentar (un registro compacto por línea).")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Procesos para cargar los archivos (default: 1 = secuencial; 0 = núcleos disponibles).")
+    p.add_argument("--json-backend", dest="backend", choices=BACKENDS, default="json",
+                   help="json (biblioteca estándar), orjson o auto (orjson si está instalado).")
+    p.add_argument("--metrics", default="", help="Escribe métricas por etapa (tiempo, filas/s, bytes, RSS) en este JSON.")
+    p.add_argument("--profile", default="", help="Perfila la corrida: escribe <base>.prof (cProfile) y <base>.txt.")
     p.add_argument("archivos", nargs="+", help="Archivos o patrones a unir (en orden o con comodines).")
     args = p.parse_args()
 
@@ -51,22 +73,47 @@ def main():
         print("⚠️ No se encontraron archivos que coincidan con los patrones dados.", file=sys.stderr)
         sys.exit(1)
 
-    combinado = []
+    try:
+        usar_backend(args.backend)
+    except ValueError as e:
+        p.error(str(e))
+    m = Metricas("unir_json_nombres", activo=bool(args.metrics or args.profile))
+    paralelo = args.workers != 1 and len(entradas) > 1
     print(f"📁 Uniendo {len(entradas)} archivo(s):")
-    for ruta in entradas:
-        print(f"  • {ruta}")
-        with open(ruta, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                combinado.extend(data)
-            else:
-                print(f"   ⚠️ {ruta} no contiene una lista JSON; se omite.", file=sys.stderr)
-
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(combinado, f, ensure_ascii=False, indent=2)
+    with m.perfilar(args.profile), EscritorRegistros(args.out, args.formato, args.compacto) as w:
+        if paralelo:
+            # Cada proceso lee y serializa un archivo JSON o un trozo de JSONL; aquí solo se escribe, en orden.
+            lotes = m.iterar("leer", leer_serializados(entradas, w.formato, args.compacto, workers=args.workers),
+                             filas=lambda lote: len(lote[1]))
+            with m.etapa("serializar", excluye=["leer"]) as e:
+                actual = None
+                for ruta, items, error in lotes:
+                    if ruta != actual:
+                        print(f"  • {ruta}")
+                        actual, leidos = ruta, 0
+                    for _, texto in items:
+                        w.escribir_texto(texto)
+                    leidos += len(items)
+                    if error:
+                        print(aviso_lectura(ruta, error, leidos), file=sys.stderr)
+                e.filas = w.total
+        else:
+            escritor = m.medir_escritor("serializar", w)
+            for ruta in entradas:
+                print(f"  • {ruta}")
+                leidos = 0
+                try:
+                    for rec in m.iterar("leer", leer_registros(ruta)):
+                        escritor.escribir(rec)
+                        leidos += 1
+                except ValueError as e:
+                    print(aviso_lectura(ruta, str(e), leidos), file=sys.stderr)
+    m.etapa_de("leer").leyo(*entradas)
+    m.etapa_de("serializar").escribio(args.out)
 
-    print(f"\n✅ Total combinado: {len(combinado)} entradas")
+    print(f"\n✅ Total combinado: {w.total} entradas")
     print(f"💾 Guardado en: {os.path.abspath(args.out)}")
+    m.guardar(args.metrics)
 
 if __name__ == "__main__":
     main()
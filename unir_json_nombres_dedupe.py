@@ -13,9 +13,39 @@ Opciones:
   --case-sensitive        No normaliza mayúsculas/minúsculas (default: insensible)
   --keep-accents          No quita acentos (default: quita acentos)
   --report report.txt     Escribe un reporte de duplicados detectados
+  --format jsonl          Formato de salida json|jsonl (default: según extensión de --out)
+  --index datos.sqlite    Escribe además un índice SQLite consultable (ver indice_consultas.py)
+  --near-dups             Agrega al reporte los casi duplicados (Sofía/Sophia, Isabel/Isabella)
+  --near-threshold 0.7    Similitud mínima (sobre las claves) para considerarlos casi duplicados
+  --compact               Lista JSON sin indentar (un registro compacto por línea)
+  --workers 8             Procesos para cargar y serializar los archivos (default: 1 = secuencial; 0 = núcleos)
+  --json-backend orjson   Backend JSON: json (estándar), orjson o auto
+Las entradas pueden ser listas JSON o JSONL (.jsonl/.ndjson), mezcladas.
+
+La unión es en streaming: en memoria solo quedan las claves normalizadas.
+Con --keep first cada registro se escribe en cuanto se lee; con --keep last se
+hace una primera pasada que solo registra el último índice de cada clave y una
+segunda que relee las entradas y escribe los ganadores, en el mismo orden.
+
+Con --workers distinto de 1 (y sin --index) cada archivo (o trozo de JSONL) se lee, se
+serializa y se le calculan las claves en un pool de procesos; aquí solo se comparan claves y se escriben
+textos ya serializados, en el mismo orden natural y con los mismos bytes.
+
+Casi duplicados (--near-dups): solo se comparan claves que comparten una clave
+fonética (bloqueo), dentro de una ventana acotada, así que el costo es casi lineal.
 """
 
-import json, argparse, glob, os, re, sys, unicodedata
+import argparse, glob, os, re, shutil, sys, tempfile, unicodedata
+from collections import defaultdict
+from contextlib import ExitStack
+from difflib import SequenceMatcher
+from functools import partial
+from operator import itemgetter
+
+from metricas import Metricas
+from registros_io import (BACKENDS, EscritorMultiple, EscritorRegistros, FORMATOS, aviso_lectura,
+                          leer_registros, leer_serializados, usar_backend)
+from tabla_nombres import EscritorDeFilas
 
 def natural_key(s: str):
     return [int(t) if t.isdigit() else t.lower()
@@ -43,6 +73,10 @@ def expand_inputs(tokens, out_path):
 def strip_accents(s: str) -> str:
     return "".join(ch for ch in unicodedata.normalize("NFKD", s) if not unicodedata.combining(ch))
 
+def normalizar(texto: str) -> str:
+    """Sin acentos, en minúsculas y sin espacios sobrantes: la clave de make_key por defecto."""
+    return strip_accents(texto or "").lower().strip()
+
 def make_key(rec: dict, field: str, case_sensitive: bool, keep_accents: bool) -> str:
     v = rec.get(field, "")
     if not isinstance(v, str):
@@ -54,15 +88,194 @@ def make_key(rec: dict, field: str, case_sensitive: bool, keep_accents: bool) ->
         k = k.lower()
     return k.strip()
 
+VOCALES = "aeiou"
+REGLAS_FONETICAS = [(re.compile(a), b) for a, b in [
+    (r"[^a-z0-9]", ""), (r"([a-z])\1+", r"\1"),  # letras y dígitos; letras dobles -> una
+    (r"ph", "f"), (r"th", "t"), (r"sh", "x"), (r"ch(?=[rl])", "k"), (r"ch", "x"),  # ch antes que c
+    (r"qu", "k"), (r"q", "k"), (r"c(?=[ei])", "s"), (r"c", "k"), (r"g(?=[ei])", "j"), (r"z", "s"),
+    (r"v", "b"), (r"w", "u"), (r"y", "i"), (r"h", ""), (r"([a-z])\1+", r"\1"),
+]]
+UMBRAL_CASI = 0.7  # sobre las claves: sofia/sophia da 0.73
+VENTANA_CASI = 50
+
+def clave_fonetica(texto: str) -> str:
+    """Forma fonética aproximada (español/inglés): Sofía y Sophia dan 'sofia'; Cristian y Christian, 'kristian'."""
+    k = strip_accents(texto).lower()
+    for patron, reemplazo in REGLAS_FONETICAS:
+        k = patron.sub(reemplazo, k)
+    return k
+
+def casi_duplicados(claves: dict, umbral: float = UMBRAL_CASI, ventana: int = VENTANA_CASI) -> list:
+    """
+    Pares de claves distintas parecidas entre sí. `claves`: {clave: índice del registro}.
+    Bloqueo: cada clave cae en el bloque de su forma fonética y en el de esa forma sin
+    vocales finales (Isabel/Isabella, Sofía/Sofie). Dentro de un bloque se compara cada
+    clave con las `ventana` siguientes, así que el trabajo es O(n · ventana). La forma
+    fonética solo decide qué se compara: la similitud se mide sobre las claves.
+    Devuelve [(similitud, clave_a, índice_a, clave_b, índice_b)], de mayor a menor similitud.
+    """
+    bloques = defaultdict(list)
+    for k in claves:
+        f = clave_fonetica(k)
+        if not f:
+            continue
+        bloques[f].append(k)
+        raiz = f.rstrip(VOCALES)
+        if raiz and raiz != f:
+            bloques[raiz + "*"].append(k)
+    # Las formas que ya son raíz comparten bloque con sus variantes con vocal final.
+    for b in list(bloques):
+        if not b.endswith("*") and b + "*" in bloques:
+            bloques[b + "*"].extend(bloques[b])
+
+    pares = {}
+    for miembros in bloques.values():
+        if len(miembros) < 2:
+            continue
+        miembros = sorted(set(miembros))
+        for i, a in enumerate(miembros):
+            sm = SequenceMatcher(None)
+            sm.set_seq2(a)  # SequenceMatcher cachea el análisis de seq2
+            for b in miembros[i + 1:i + 1 + ventana]:
+                if (a, b) in pares:
+                    continue
+                sm.set_seq1(b)
+                # Cotas baratas antes de la comparación completa.
+                if sm.real_quick_ratio() < umbral or sm.quick_ratio() < umbral:
+                    continue
+                sim = sm.ratio()
+                if sim >= umbral:
+                    pares[(a, b)] = sim
+    res = [(sim, a, claves[a], b, claves[b]) for (a, b), sim in pares.items()]
+    res.sort(key=lambda x: (-x[0], x[2], x[4]))
+    return res
+
+def iter_registros(entradas, avisar: bool = True):
+    """Itera los registros de todas las entradas en orden, sin cargarlas juntas."""
+    for ruta in entradas:
+        leidos = 0
+        try:
+            for rec in leer_registros(ruta):
+                leidos += 1
+                yield rec
+        except ValueError as e:
+            if avisar:
+                print(aviso_lectura(ruta, str(e), leidos), file=sys.stderr)
+
+def deduplicar(entradas, escritor, clave, keep: str = "first", dups=None, idx_by_key=None) -> tuple:
+    """
+    Escribe en `escritor` los registros sin duplicados según clave(rec).
+    Cada duplicado se anota en `dups` (archivo de texto o None) con el formato del reporte.
+    `idx_by_key`: dict opcional que queda con {clave: índice conservado} (p. ej. para casi duplicados).
+    Devuelve (total_leidos, conservados).
+    """
+    return _deduplicar(lambda pasada: iter_registros(entradas, avisar=pasada == 0),
+                       escritor, clave, keep, dups, idx_by_key)
+
+def deduplicar_registros(registros, escritor, clave, keep: str = "first", dups=None, idx_by_key=None) -> tuple:
+    """Como deduplicar(), pero sobre registros ya en memoria (una lista; --keep last la recorre dos veces)."""
+    return _deduplicar(lambda pasada: iter(registros), escritor, clave, keep, dups, idx_by_key)
+
+def deduplicar_tabla(tabla, escritor, clave, keep: str = "first", dups=None, idx_by_key=None) -> tuple:
+    """
+    Como deduplicar(), sobre una tabla_nombres.TablaNombres: clave() recibe vistas de fila
+    (con .get, como make_key) y `escritor` recibe los registros como dict.
+    """
+    return _deduplicar(lambda pasada: iter(tabla), EscritorDeFilas(escritor), clave, keep, dups, idx_by_key)
+
+def deduplicar_paralelo(entradas, escritor, clave, keep: str = "first", dups=None, idx_by_key=None,
+                        workers: int = 0, medir_lectura=None) -> tuple:
+    """
+    Como deduplicar(), con la lectura, la serialización y las claves en un pool de procesos.
+    `escritor` es un EscritorRegistros (recibe textos ya serializados en su formato) y `clave`
+    debe poder enviarse a otro proceso (p. ej. functools.partial(make_key, ...)).
+    `medir_lectura` envuelve el iterador de lotes (ruta, items, error) del pool
+    (p. ej. partial(m.iterar, "leer", filas=...)).
+    """
+    def leer(pasada):
+        # Con --keep last la primera pasada solo necesita las claves.
+        solo_claves = keep == "last" and pasada == 0
+        lotes = leer_serializados(entradas, escritor.formato, escritor.compacto, clave, workers, solo_claves)
+        actual = None
+        for ruta, items, error in (medir_lectura(lotes) if medir_lectura else lotes):
+            if ruta != actual:
+                actual, leidos = ruta, 0
+            yield from items
+            leidos += len(items)
+            if error and pasada == 0:
+                print(aviso_lectura(ruta, error, leidos), file=sys.stderr)
+    return _deduplicar(leer, _EscritorTextos(escritor), itemgetter(0), keep, dups, idx_by_key)
+
+class _EscritorTextos:
+    def __init__(self, escritor):
+        self.escritor = escritor
+
+    def escribir(self, item: tuple) -> None:
+        self.escritor.escribir_texto(item[1])
+
+def _deduplicar(leer, escritor, clave, keep, dups, idx_by_key) -> tuple:
+    # leer(pasada) devuelve un iterador nuevo sobre los mismos registros.
+    if idx_by_key is None:
+        idx_by_key = {}
+    total = 0
+    for i, rec in enumerate(leer(0)):
+        total += 1
+        k = clave(rec)
+        if k in idx_by_key:
+            if dups is not None:
+                dups.write(f"{k}  (primer: {idx_by_key[k]}, duplicado: {i})\n")
+            if keep == "last":
+                idx_by_key[k] = i
+        else:
+            idx_by_key[k] = i
+            if keep == "first":
+                escritor.escribir(rec)
+
+    if keep == "last":
+        # Segunda pasada: se conserva el registro si es el último visto para su clave.
+        for i, rec in enumerate(leer(1)):
+            if idx_by_key[clave(rec)] == i:
+                escritor.escribir(rec)
+    return total, len(idx_by_key)
+
+def escribir_reporte(ruta: str, removidos: int, dups, key: str, keep: str, case_sensitive: bool,
+                     keep_accents: bool, casi: list = None, umbral: float = UMBRAL_CASI) -> None:
+    """Reporte de duplicados: encabezado, las líneas anotadas en `dups` y, si hay, los casi duplicados."""
+    with open(ruta, "w", encoding="utf-8") as rf:
+        rf.write(f"Duplicados detectados: {removidos}\n")
+        rf.write(f"Clave: {key}, keep={keep}, case_sensitive={case_sensitive}, keep_accents={keep_accents}\n\n")
+        dups.seek(0)
+        shutil.copyfileobj(dups, rf)
+        if casi is not None:
+            rf.write(f"\nCasi duplicados (umbral={umbral}): {len(casi)}\n\n")
+            for sim, a, ia, b, ib in casi:
+                rf.write(f"{a} ~ {b}  (similitud: {sim:.2f}, índices: {ia}, {ib})\n")
+
 def main():
     p = argparse.ArgumentParser(description="Une JSONs y elimina duplicados por clave.")
-    p.add_argument("--out", required=True, help="Archivo JSON de salida.")
+    p.add_argument("--out", required=True, help="Archivo JSON/JSONL de salida.")
+    p.add_argument("--format", dest="formato", choices=FORMATOS, default=None,
+                   help="Formato de salida: json o jsonl (default: según extensión de --out).")
     p.add_argument("--key", default="nombre", help="Campo clave para deduplicar (default: nombre).")
     p.add_argument("--keep", choices=["first","last"], default="first",
                    help="Si hay duplicados, conservar el primero o el último (default: first).")
     p.add_argument("--case-sensitive", action="store_true", help="No normaliza mayúsculas/minúsculas.")
     p.add_argument("--keep-accents", action="store_true", help="No elimina acentos al comparar.")
     p.add_argument("--report", default="", help="Ruta de archivo para reporte de duplicados.")
+    p.add_argument("--index", default="",
+                   help="Escribe además un índice SQLite (nombre normalizado, origen, género, numerología).")
+    p.add_argument("--near-dups", dest="casi", action="store_true",
+                   help="Detecta casi duplicados (variantes ortográficas) y los agrega al reporte.")
+    p.add_argument("--near-threshold", dest="umbral_casi", type=float, default=UMBRAL_CASI,
+                   help=f"Similitud mínima (0-1) para los casi duplicados (default: {UMBRAL_CASI}).")
+    p.add_argument("--compact", dest="compacto", action="store_true",
+                   help="Lista JSON sin indentar (un registro compacto por línea).")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Procesos para cargar los archivos (default: 1 = secuencial; 0 = núcleos disponibles).")
+    p.add_argument("--json-backend", dest="backend", choices=BACKENDS, default="json",
+                   help="json (biblioteca estándar), orjson o auto (orjson si está instalado).")
+    p.add_argument("--metrics", default="", help="Escribe métricas por etapa (tiempo, filas/s, bytes, RSS) en este JSON.")
+    p.add_argument("--profile", default="", help="Perfila la corrida: escribe <base>.prof (cProfile) y <base>.txt.")
     p.add_argument("archivos", nargs="+", help="Archivos/patrones a unir (ej. nombres_*.json).")
     args = p.parse_args()
 
@@ -74,49 +287,65 @@ def main():
     print(f"📁 Uniendo {len(entradas)} archivo(s):")
     for r in entradas: print("  •", r)
 
-    out = []
-    for ruta in entradas:
-        with open(ruta, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                out.extend(data)
+    try:
+        usar_backend(args.backend)
+    except ValueError as e:
+        p.error(str(e))
+    m = Metricas("unir_json_nombres_dedupe", activo=bool(args.metrics or args.profile))
+    clave = partial(make_key, field=args.key, case_sensitive=args.case_sensitive, keep_accents=args.keep_accents)
+    # El índice SQLite necesita los registros como dict: con --index se lee en este proceso.
+    paralelo = args.workers != 1 and len(entradas) > 1 and not args.index
+    # Las líneas del reporte van a un temporal: el encabezado necesita el total de removidos.
+    dups = tempfile.TemporaryFile("w+", encoding="utf-8") if args.report else None
+    with m.perfilar(args.profile):
+        with m.etapa("deduplicar", excluye=["serializar", "leer"]) as e, ExitStack() as pila:
+            w = pila.enter_context(EscritorRegistros(args.out, args.formato, args.compacto))
+            if args.index:
+                # Import diferido: indice_consultas reutiliza make_key/strip_accents de este módulo.
+                from indice_consultas import EscritorIndice
+                w = EscritorMultiple(w, pila.enter_context(EscritorIndice(args.index)))
+            idx_by_key = {}
+            if paralelo:
+                # Cada proceso lee y serializa un archivo o un trozo de JSONL ("leer"); aquí solo se escribe.
+                total, conservados = deduplicar_paralelo(entradas, m.medir_escritor("serializar", w), clave,
+                                                         args.keep, dups, idx_by_key, args.workers,
+                                                         partial(m.iterar, "leer", filas=lambda lote: len(lote[1])))
+                m.etapa_de("leer").leyo(*entradas)
             else:
-                print(f"   ⚠️ {ruta} no es una lista JSON; se omite.", file=sys.stderr)
-
-    # Deduplicación
-    idx_by_key = {}
-    dups = []
-    for i, rec in enumerate(out):
-        k = make_key(rec, args.key, args.case_sensitive, args.keep_accents)
-        if k in idx_by_key:
-            dups.append((k, idx_by_key[k], i))
-            if args.keep == "last":
-                idx_by_key[k] = i
-        else:
-            idx_by_key[k] = i
+                total, conservados = deduplicar(entradas, m.medir_escritor("serializar", w), clave, args.keep,
+                                                dups, idx_by_key)
+            e.filas = total
+            e.leyo(*entradas)
+        m.etapa_de("serializar").escribio(args.out, args.index)
 
-    # Construir resultado sin duplicados
-    keep_indices = set(idx_by_key.values())
-    nuevo = [rec for i, rec in enumerate(out) if i in keep_indices]
-
-    # Reporte
-    removed = len(out) - len(nuevo)
-    if args.report:
-        with open(args.report, "w", encoding="utf-8") as rf:
-            rf.write(f"Duplicados detectados: {removed}\n")
-            rf.write(f"Clave: {args.key}, keep={args.keep}, case_sensitive={args.case_sensitive}, keep_accents={args.keep_accents}\n\n")
-            for k, first_i, dup_i in dups:
-                rf.write(f"{k}  (primer: {first_i}, duplicado: {dup_i})\n")
+        casi = []
+        if args.casi:
+            with m.etapa("casi_duplicados") as e:
+                casi = casi_duplicados(idx_by_key, args.umbral_casi)
+                e.filas = len(idx_by_key)
+        del idx_by_key
 
-    with open(args.out, "w", encoding="utf-8") as f:
-        json.dump(nuevo, f, ensure_ascii=False, indent=2)
+        # Reporte
+        removed = total - conservados
+        if args.report:
+            with m.etapa("reporte") as e:
+                escribir_reporte(args.report, removed, dups, args.key, args.keep, args.case_sensitive,
+                                 args.keep_accents, casi if args.casi else None, args.umbral_casi)
+                dups.close()
+                e.filas = removed
+                e.escribio(args.report)
 
-    print(f"\n✅ Entradas totales leídas: {len(out)}")
+    print(f"\n✅ Entradas totales leídas: {total}")
     print(f"🧹 Duplicados removidos:   {removed}")
+    if args.casi:
+        print(f"🔍 Casi duplicados:        {len(casi)}  (umbral={args.umbral_casi})")
     print(f"📌 Clave usada:            {args.key}  (keep={args.keep}, case_sensitive={args.case_sensitive}, keep_accents={args.keep_accents})")
     print(f"💾 Guardado en:            {os.path.abspath(args.out)}")
     if args.report:
         print(f"📝 Reporte:                {os.path.abspath(args.report)}")
+    if args.index:
+        print(f"🗂️ Índice:                 {os.path.abspath(args.index)}")
+    m.guardar(args.metrics)
 
 if __name__ == "__main__":
     main()